@@ -23,7 +23,8 @@ CREATE TABLE IF NOT EXISTS content_records (
     retrieved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     metadata JSONB DEFAULT '{}',
     word_count INTEGER,
-    CONSTRAINT fk_url FOREIGN KEY (url) REFERENCES monitored_urls(url) ON DELETE CASCADE
+    -- Monitored URL the content was found through (feed entries and blog posts have their own url)
+    source_url TEXT REFERENCES monitored_urls(url) ON DELETE CASCADE
 );
 
 CREATE TABLE IF NOT EXISTS query_logs (
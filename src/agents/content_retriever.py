@@ -1,6 +1,7 @@
 # src/agents/content_retriever.py
 import asyncio
 import aiohttp
+import hashlib
 from bs4 import BeautifulSoup
 from langchain_community.document_loaders import WebBaseLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -33,34 +34,108 @@ class ContentRetriever:
         # Maximum number of blog posts to retrieve from a blog index page
         self.max_blog_posts = 10
 
-    async def retrieve_content(self, urls: list) -> list:
-        """Retrieve content from multiple URLs concurrently"""
+    async def retrieve_content(self, urls: list, max_concurrent: int = 16) -> list:
+        """Retrieve content from multiple URLs, scraping and processing up to max_concurrent at once"""
         # Use WebScraper to scrape multiple URLs concurrently
-        results = await self.web_scraper.scrape_multiple_urls(urls, max_concurrent=5)
+        results = await self.web_scraper.scrape_multiple_urls(urls, max_concurrent=max_concurrent)
+
+        # Fetch the stored hashes of every candidate URL in one query and
+        # buffer new content records so they are written in one batch
+        known_hashes = self.db_manager.get_latest_content_hashes(self._candidate_urls(results))
+        pending_records = []
+        # URLs a task has started storing, so concurrent tasks don't store them twice
+        in_flight = set()
+
+        # Process the scraped pages concurrently so embedding calls and blog
+        # post fetches for different URLs overlap instead of running back to back
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def process(result):
+            async with semaphore:
+                return await self._process_result(result, known_hashes, pending_records, in_flight)
 
         valid_content = []
+        try:
+            processed = await asyncio.gather(*(process(result) for result in results),
+                                             return_exceptions=True)
+            for result, content in zip(results, processed):
+                if isinstance(content, Exception):
+                    logging.error(f"Error processing {result['url']}: {content}")
+                    continue
+                valid_content.extend(content)
+        finally:
+            # Save the batch's vector store additions once, then persist the
+            # records of content that made it into the vector store
+            await asyncio.to_thread(self.vector_store.persist)
+            self.db_manager.bulk_insert_content_records(pending_records)
+
+        return valid_content
+
+    async def _process_result(self, result: dict, known_hashes: dict, pending_records: list,
+                              in_flight: set) -> list:
+        """Process a single scraping result into its list of content items"""
+        if not result['success']:
+            logging.error(f"Failed to fetch {result['url']}: {result.get('error', 'Unknown error')}")
+            return []
+
+        # Process the result based on content type
+        if result.get('metadata', {}).get('type') == 'feed':
+            # Handle RSS/Atom feed
+            return await self._process_feed_content(result, known_hashes, pending_records, in_flight)
+
+        # Handle regular HTML content
+        processed_content = await self._process_html_content(result, known_hashes, pending_records,
+                                                             in_flight)
+        if not processed_content:
+            return []
+
+        content = [processed_content]
+        # If this is a blog index page, also process its posts
+        if self._is_blog_index_from_result(result):
+            content.extend(await self._process_blog_index_from_result(
+                result, known_hashes, pending_records, in_flight
+            ))
+        return content
+
+    def _candidate_urls(self, results: list) -> list:
+        """Collect the URLs whose stored content hash may be checked for these results"""
+        urls = []
         for result in results:
             if not result['success']:
-                logging.error(f"Failed to fetch {result['url']}: {result.get('error', 'Unknown error')}")
                 continue
+            urls.append(result['url'])
+            urls.extend(entry['link'] for entry in result.get('feed_entries', []) if entry.get('link'))
+        return urls
+
+    def _is_content_new(self, url: str, content_hash, known_hashes: dict = None) -> bool:
+        """Check content hash against the batch lookup, or the database outside a batch"""
+        if known_hashes is None:
+            return self.db_manager.is_content_new(url, content_hash)
+        return known_hashes.get(url) != str(content_hash)
+
+    def _claim(self, url: str, in_flight: set = None) -> bool:
+        """Mark a URL as being stored in this batch; False if another task already claimed it"""
+        if in_flight is None:
+            return True
+        if url in in_flight:
+            return False
+        in_flight.add(url)
+        return True
 
-            # Process the result based on content type
-            if result.get('metadata', {}).get('type') == 'feed':
-                # Handle RSS/Atom feed
-                feed_content = await self._process_feed_content(result)
-                valid_content.extend(feed_content)
-            else:
-                # Handle regular HTML content
-                processed_content = await self._process_html_content(result)
-                if processed_content:
-                    valid_content.append(processed_content)
+    def _record_content(self, url: str, content_hash, title: str, content: str,
+                        known_hashes: dict = None, pending_records: list = None,
+                        source_url: str = None):
+        """Store a content record, deferring the insert when a batch is active
 
-                    # If this is a blog index page, also process its posts
-                    if self._is_blog_index_from_result(result):
-                        blog_posts = await self._process_blog_index_from_result(result)
-                        valid_content.extend(blog_posts)
+        source_url is the monitored URL the content was found through, when not url itself
+        """
+        source_url = source_url or url
+        if pending_records is None:
+            self.db_manager.update_content_record(url, content_hash, title, content, source_url)
+            return
 
-        return valid_content
+        pending_records.append((url, content_hash, title, content, source_url))
+        known_hashes[url] = str(content_hash)
 
     def _is_blog_index_from_result(self, result: dict) -> bool:
         """Determine if a scraping result is from a blog index page"""
@@ -91,8 +166,10 @@ class ContentRetriever:
 
         return False
 
-    async def _process_html_content(self, result: dict) -> dict:
-        """Process HTML content from WebScraper result"""
+    async def _process_html_content(self, result: dict, known_hashes: dict = None,
+                                    pending_records: list = None, in_flight: set = None,
+                                    source_url: str = None) -> dict:
+        """Process HTML content from WebScraper result (source_url: the blog index of a post)"""
         url = result['url']
         content = result['content']
         title = result['title']
@@ -100,7 +177,7 @@ class ContentRetriever:
         # Check if content is new (compare with stored hash)
         content_hash = result['content_hash']
 
-        if self.db_manager.is_content_new(url, content_hash):
+        if self._is_content_new(url, content_hash, known_hashes) and self._claim(url, in_flight):
             # Split and store in vector database
             chunks = self.text_splitter.split_text(content)
 
@@ -108,8 +185,9 @@ class ContentRetriever:
                 logging.warning(f"No content chunks extracted from {url}")
                 return None
 
-            # Store in vector database
-            self.vector_store.add_texts(
+            # Store in vector database without blocking the event loop
+            ids = await asyncio.to_thread(
+                self.vector_store.add_texts,
                 texts=chunks,
                 metadatas=[{
                     'url': url,
@@ -120,8 +198,14 @@ class ContentRetriever:
                 } for i in range(len(chunks))]
             )
 
+            if not ids:
+                # Not recorded, so the content is picked up again on the next run
+                logging.error(f"Failed to store content from {url} in the vector store")
+                return None
+
             # Update database record
-            self.db_manager.update_content_record(url, content_hash, title, content)
+            self._record_content(url, content_hash, title, content, known_hashes, pending_records,
+                                 source_url)
 
             return {
                 'url': url,
@@ -133,7 +217,8 @@ class ContentRetriever:
         else:
             return {'url': url, 'is_new': False}
 
-    async def _process_feed_content(self, result: dict) -> list:
+    async def _process_feed_content(self, result: dict, known_hashes: dict = None,
+                                    pending_records: list = None, in_flight: set = None) -> list:
         """Process RSS/Atom feed content from WebScraper result"""
         url = result['url']
         feed_entries = result.get('feed_entries', [])
@@ -149,18 +234,20 @@ class ContentRetriever:
             if not entry_link:
                 continue
 
-            # Generate a hash for this entry
-            entry_hash = hash(entry_content)
+            # Generate a hash for this entry; hash() is salted per process, so it
+            # would never match the hash recorded by an earlier run
+            entry_hash = hashlib.md5(entry_content.encode()).hexdigest()
 
-            if self.db_manager.is_content_new(entry_link, entry_hash):
+            if self._is_content_new(entry_link, entry_hash, known_hashes) and self._claim(entry_link, in_flight):
                 # Split and store in vector database
                 chunks = self.text_splitter.split_text(entry_content)
 
                 if not chunks:
                     continue
 
-                # Store in vector database
-                self.vector_store.add_texts(
+                # Store in vector database without blocking the event loop
+                ids = await asyncio.to_thread(
+                    self.vector_store.add_texts,
                     texts=chunks,
                     metadatas=[{
                         'url': entry_link,
@@ -172,8 +259,14 @@ class ContentRetriever:
                     } for i in range(len(chunks))]
                 )
 
+                if not ids:
+                    # Not recorded, so the entry is picked up again on the next run
+                    logging.error(f"Failed to store feed entry {entry_link} in the vector store")
+                    continue
+
                 # Update database record
-                self.db_manager.update_content_record(entry_link, entry_hash, entry_title, entry_content)
+                self._record_content(entry_link, entry_hash, entry_title, entry_content,
+                                     known_hashes, pending_records, source_url=url)
 
                 processed_entries.append({
                     'url': entry_link,
@@ -190,7 +283,9 @@ class ContentRetriever:
 
         return processed_entries
 
-    async def _process_blog_index_from_result(self, result: dict) -> list:
+    async def _process_blog_index_from_result(self, result: dict, known_hashes: dict = None,
+                                              pending_records: list = None,
+                                              in_flight: set = None) -> list:
         """Process a blog index page by extracting and fetching individual posts"""
         url = result['url']
         content = result['content']
@@ -250,13 +345,18 @@ class ContentRetriever:
         # Use WebScraper to fetch all blog posts
         blog_results = await self.web_scraper.scrape_multiple_urls(post_links)
 
+        if known_hashes is not None:
+            unknown_urls = [url for url in self._candidate_urls(blog_results) if url not in known_hashes]
+            known_hashes.update(self.db_manager.get_latest_content_hashes(unknown_urls))
+
         processed_posts = []
         for blog_result in blog_results:
             if not blog_result['success']:
                 logging.error(f"Failed to fetch blog post {blog_result['url']}: {blog_result.get('error')}")
                 continue
 
-            processed_post = await self._process_html_content(blog_result)
+            processed_post = await self._process_html_content(blog_result, known_hashes, pending_records,
+                                                              in_flight, source_url=url)
             if processed_post:
                 processed_posts.append(processed_post)
 
@@ -3,18 +3,30 @@ from langchain.chains import RetrievalQAWithSourcesChain
 from langchain.prompts import PromptTemplate
 from langchain_community.tools import DuckDuckGoSearchRun
 from langchain_core.documents import Document
-from langchain_community.vectorstores import FAISS
-from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
+from langchain_core.retrievers import BaseRetriever
+from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.memory import ConversationBufferMemory
+from typing import AsyncIterator, List, Optional, Union
 import logging
 import datetime
 import re
 
+# Where RetrievalQAWithSourcesChain ends the answer when splitting off its sources
+_ANSWER_END_RE = re.compile(r"SOURCES?:|QUESTION:\s", re.IGNORECASE)
+_ANSWER_END_HOLDBACK = len("QUESTION:")
+
+class _StaticRetriever(BaseRetriever):
+    """Retriever that hands back a fixed, already-ranked list of documents"""
+
+    documents: List[Document]
+
+    def _get_relevant_documents(self, query: str, *, run_manager) -> List[Document]:
+        return self.documents
+
 class QueryEngine:
     def __init__(self, vector_store, model_config):
         self.vector_store = vector_store
         self.llm = ChatGoogleGenerativeAI(**model_config)
-        self.embeddings = GoogleGenerativeAIEmbeddings(model='models/embedding-001')
         self.web_search = DuckDuckGoSearchRun()
 
         # Initialize conversation memory
@@ -52,32 +64,65 @@ class QueryEngine:
             input_variables=["context", "web_results", "chat_history", "question"]
         )
 
-    async def answer_query(self, question: str, use_web_search: bool = True, chat_history: list = []) -> dict:
-        """Answer user query using RAG + web search with conversation memory"""
+    async def answer_query(self, question: str, use_web_search: bool = True, chat_history: list = [],
+                           query_embedding: Optional[List[float]] = None) -> dict:
+        """Answer user query using RAG + web search with conversation memory
 
-        # 1. Retrieve relevant documents from vector store
-        retriever = self.vector_store.as_retriever(search_kwargs={"k": 5})
-        relevant_docs = retriever.get_relevant_documents(question)
+        query_embedding, when the caller already embedded the question, is used for
+        the knowledge base search instead of embedding the question again
+        """
 
-        # 2. Perform web search if enabled
-        if use_web_search:
-            try:
-                search_results_text = await self.web_search.arun(question) # Use async version
-                # Create a Document object for the web results
-                web_doc = Document(
-                    page_content=search_results_text,
-                    metadata={"source": "Web Search"}
-                )
-                # Add the web search result to your list of documents
-                relevant_docs.append(web_doc)
-            except Exception as e:
-                logging.warning(f"Web search failed: {e}")
+        # 1-2. Retrieve relevant documents and web search results
+        relevant_docs = await self._retrieve_documents(question, use_web_search, query_embedding)
+
+        # 3-4. Generate answer using LLM with memory
+        qa_chain = self._qa_chain(relevant_docs, chat_history)
+        result = await qa_chain.ainvoke({"question": question})
+
+        # 5. Extract and format sources
+        return self._build_response(result["answer"], relevant_docs, use_web_search)
+
+    async def astream_answer(self, question: str, use_web_search: bool = True,
+                             chat_history: list = [],
+                             query_embedding: Optional[List[float]] = None) -> AsyncIterator[Union[str, dict]]:
+        """
+        Answer user query like answer_query, streaming the answer as it is generated
+
+        Yields the answer text in chunks, then one final dict shaped like the
+        answer_query result (answer, sources, confidence, ...)
+        """
+        relevant_docs = await self._retrieve_documents(question, use_web_search, query_embedding)
+        qa_chain = self._qa_chain(relevant_docs, chat_history)
+
+        # Tokens come from the chain's model call; the chain's own output is the
+        # answer with its SOURCES line split off, as answer_query returns it
+        generated, emitted, result = "", "", None
+        async for event in qa_chain.astream_events({"question": question}, version="v2"):
+            if event["event"] == "on_chat_model_stream":
+                generated += event["data"]["chunk"].content
+                visible = self._streamable_answer(generated)
+                if len(visible) > len(emitted):
+                    yield visible[len(emitted):]
+                    emitted = visible
+            elif event["event"] == "on_chain_end" and not event["parent_ids"]:
+                result = event["data"]["output"]
+
+        answer = result["answer"]
+        if answer.startswith(emitted):
+            if len(answer) > len(emitted):
+                yield answer[len(emitted):]
+        else:
+            logging.warning("Streamed answer differs from the chain's parsed answer")
+
+        yield self._build_response(answer, relevant_docs, use_web_search)
 
-        # 3. Create a combined, in-memory retriever from all documents
-        combined_vector_store = FAISS.from_documents(relevant_docs, self.embeddings)
-        combined_retriever = combined_vector_store.as_retriever(search_kwargs={"k": 10})
+    def _qa_chain(self, relevant_docs: List[Document], chat_history: list) -> RetrievalQAWithSourcesChain:
+        """Answer chain over the retrieved documents, shared by answer_query and astream_answer"""
+        # Combine all documents into one retriever. The knowledge base hits are
+        # already ranked by the vector store and every document goes into the
+        # prompt, so they are passed through as-is rather than re-embedded and re-scored
+        combined_retriever = _StaticRetriever(documents=relevant_docs)
 
-        # 4. Generate answer using LLM with memory
         qa_chain = RetrievalQAWithSourcesChain.from_chain_type(
             llm=self.llm,
             retriever=combined_retriever,
@@ -97,15 +142,52 @@ class QueryEngine:
                 elif message["role"] == "assistant":
                     self.memory.chat_memory.add_ai_message(message["content"])
 
-        result = await qa_chain({"question": question})
+        return qa_chain
+
+    @staticmethod
+    def _streamable_answer(generated: str) -> str:
+        """Part of the text generated so far that the chain will keep as the answer"""
+        # The chain cuts the answer where its SOURCES: (or QUESTION:) line starts;
+        # until one appears, hold back enough characters to cover a partial marker
+        match = _ANSWER_END_RE.search(generated)
+        if match:
+            return generated[:match.start()]
+        return generated[:max(len(generated) - _ANSWER_END_HOLDBACK, 0)]
+
+    async def _retrieve_documents(self, question: str, use_web_search: bool,
+                                  query_embedding: Optional[List[float]] = None) -> List[Document]:
+        """Retrieve knowledge base documents, plus web search results if enabled"""
+
+        # 1. Retrieve relevant documents from vector store, reusing the question's
+        # embedding when the caller already computed it
+        if query_embedding is not None:
+            relevant_docs = self.vector_store.similarity_search_by_vector(query_embedding, k=5)
+        else:
+            retriever = self.vector_store.as_retriever(search_kwargs={"k": 5})
+            relevant_docs = retriever.get_relevant_documents(question)
 
-        # 5. Extract and format sources
-        sources = self._extract_sources(relevant_docs)
+        # 2. Perform web search if enabled
+        if use_web_search:
+            try:
+                search_results_text = await self.web_search.arun(question) # Use async version
+                # Create a Document object for the web results
+                web_doc = Document(
+                    page_content=search_results_text,
+                    metadata={"source": "Web Search"}
+                )
+                # Add the web search result to your list of documents
+                relevant_docs.append(web_doc)
+            except Exception as e:
+                logging.warning(f"Web search failed: {e}")
+
+        return relevant_docs
 
+    def _build_response(self, answer: str, relevant_docs: List[Document], use_web_search: bool) -> dict:
+        """Package an answer with its sources and confidence"""
         return {
-            "answer": result["answer"],
-            "sources": sources,
-            "confidence": self._assess_confidence(relevant_docs, result["answer"]),
+            "answer": answer,
+            "sources": self._extract_sources(relevant_docs),
+            "confidence": self._assess_confidence(relevant_docs, answer),
             "web_search_used": use_web_search,
             "timestamp": datetime.datetime.now().isoformat()
         }
@@ -1,4 +1,5 @@
 # src/agents/summarizer.py
+import asyncio
 from langchain.chains.summarize import load_summarize_chain
 from langchain.prompts import PromptTemplate
 from langchain_google_genai import GoogleGenerativeAI
@@ -36,52 +37,80 @@ class Summarizer:
 
     def create_daily_summary(self, topic_filter: str = "") -> dict:
         """Create daily summary of new content"""
-
-        # Get content from the last 24 hours
-        yesterday = datetime.now() - timedelta(days=1)
-        new_content = self.db_manager.get_content_since(yesterday, topic_filter)
+        new_content = self._get_daily_content(topic_filter)
 
         if not new_content:
-            return {
-                "summary": "No new content found for the specified period.",
-                "content_count": 0,
-                "sources": []
-            }
-
-        # Prepare content for summarization
-        content_text = "\n\n".join([
-            f"Title: {item['title']}\nSource: {item['url']}\nContent: {item['content'][:500]}..."
-            for item in new_content
-        ])
+            return self._empty_summary("No new content found for the specified period.")
 
         # Generate summary
-        summary = self.summarize_chain.run(content_text)
+        summary = self.summarize_chain.run(self._format_daily_content(new_content))
 
-        # Extract sources
-        sources = [{"title": item['title'], "url": item['url']} for item in new_content]
+        return self._daily_summary_result(summary, new_content, topic_filter)
 
-        return {
-            "summary": summary,
-            "content_count": len(new_content),
-            "sources": sources,
-            "generated_at": datetime.now().isoformat(),
-            "topic_filter": topic_filter
-        }
+    async def acreate_daily_summary(self, topic_filter: str = "") -> dict:
+        """Create daily summary of new content without blocking the event loop"""
+        new_content = await asyncio.to_thread(self._get_daily_content, topic_filter)
+
+        if not new_content:
+            return self._empty_summary("No new content found for the specified period.")
+
+        # Generate summary
+        summary = await self.summarize_chain.arun(self._format_daily_content(new_content))
+
+        return self._daily_summary_result(summary, new_content, topic_filter)
 
     def create_topic_summary(self, topic: str, days_back: int = 7) -> dict:
         """Create focused summary for specific topic"""
+        topic_content = self._get_topic_content(topic, days_back)
 
-        since_date = datetime.now() - timedelta(days=days_back)
-        topic_content = self.db_manager.search_content_by_topic(topic, since_date)
+        if not topic_content:
+            return self._empty_summary(f"No content found for topic '{topic}' in the last {days_back} days.")
+
+        summary = self.llm.predict(self._format_topic_prompt(topic, topic_content))
+
+        return self._topic_summary_result(summary, topic_content, topic, days_back)
+
+    async def acreate_topic_summary(self, topic: str, days_back: int = 7) -> dict:
+        """Create focused summary for specific topic without blocking the event loop"""
+        topic_content = await asyncio.to_thread(self._get_topic_content, topic, days_back)
 
         if not topic_content:
-            return {
-                "summary": f"No content found for topic '{topic}' in the last {days_back} days.",
-                "content_count": 0,
-                "sources": []
-            }
+            return self._empty_summary(f"No content found for topic '{topic}' in the last {days_back} days.")
 
-        # Topic-specific prompt
+        summary = await self.llm.apredict(self._format_topic_prompt(topic, topic_content))
+
+        return self._topic_summary_result(summary, topic_content, topic, days_back)
+
+    def _get_daily_content(self, topic_filter: str) -> list:
+        """Get content from the last 24 hours"""
+        yesterday = datetime.now() - timedelta(days=1)
+        return self.db_manager.get_content_since(yesterday, topic_filter)
+
+    def _get_topic_content(self, topic: str, days_back: int) -> list:
+        """Get content about a topic from the last days_back days"""
+        since_date = datetime.now() - timedelta(days=days_back)
+        return self.db_manager.search_content_by_topic(topic, since_date)
+
+    @staticmethod
+    def _empty_summary(message: str) -> dict:
+        """Summary returned when there is no content to summarize"""
+        return {
+            "summary": message,
+            "content_count": 0,
+            "sources": []
+        }
+
+    @staticmethod
+    def _format_daily_content(new_content: list) -> str:
+        """Prepare content for summarization"""
+        return "\n\n".join([
+            f"Title: {item['title']}\nSource: {item['url']}\nContent: {item['content'][:500]}..."
+            for item in new_content
+        ])
+
+    @staticmethod
+    def _format_topic_prompt(topic: str, topic_content: list) -> str:
+        """Build the topic-specific summarization prompt"""
         topic_prompt = f"""
         Create a focused summary about "{topic}" based on the following content:
 
@@ -101,7 +130,25 @@ class Summarizer:
             for item in topic_content
         ])
 
-        summary = self.llm.predict(topic_prompt.format(text=content_text))
+        return topic_prompt.format(text=content_text)
+
+    @staticmethod
+    def _daily_summary_result(summary: str, new_content: list, topic_filter: str) -> dict:
+        """Package a generated daily summary with its sources"""
+        # Extract sources
+        sources = [{"title": item['title'], "url": item['url']} for item in new_content]
+
+        return {
+            "summary": summary,
+            "content_count": len(new_content),
+            "sources": sources,
+            "generated_at": datetime.now().isoformat(),
+            "topic_filter": topic_filter
+        }
+
+    @staticmethod
+    def _topic_summary_result(summary: str, topic_content: list, topic: str, days_back: int) -> dict:
+        """Package a generated topic summary with its sources"""
         sources = [{"title": item['title'], "url": item['url']} for item in topic_content]
 
         return {
@@ -1,6 +1,6 @@
 # src/data/database.py
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from datetime import datetime
 from typing import Optional
 import logging
@@ -38,10 +38,20 @@ class DatabaseManager:
                         content TEXT,
                         retrieved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         metadata JSONB,
-                        FOREIGN KEY (url) REFERENCES monitored_urls(url)
+                        source_url TEXT REFERENCES monitored_urls(url)
                     )
                 """)
 
+                # Feed entries and blog posts are stored under their own links, which
+                # aren't monitored URLs, so the monitored parent goes in source_url;
+                # tables created before that still carry the foreign key on url
+                cur.execute("""
+                    ALTER TABLE content_records
+                    ADD COLUMN IF NOT EXISTS source_url TEXT REFERENCES monitored_urls(url),
+                    DROP CONSTRAINT IF EXISTS content_records_url_fkey,
+                    DROP CONSTRAINT IF EXISTS fk_url
+                """)
+
                 # Query logs
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS query_logs (
@@ -76,6 +86,29 @@ class DatabaseManager:
             logging.error(f"Error adding URL {url}: {e}")
             return False
 
+    def add_urls_bulk(self, urls: list, added_by: str = "", tags: list = []) -> bool:
+        """Add several URLs to monitor with the same tags in a single statement"""
+        # One upsert cannot touch the same row twice, so drop repeated URLs
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return True
+
+        try:
+            with psycopg2.connect(self.connection_string) as conn:
+                with conn.cursor() as cur:
+                    execute_values(cur, """
+                        INSERT INTO monitored_urls (url, added_by, tags)
+                        VALUES %s
+                        ON CONFLICT (url) DO UPDATE SET
+                        is_active = TRUE,
+                        tags = EXCLUDED.tags
+                    """, [(url, added_by, list(tags or [])) for url in urls])
+                    conn.commit()
+                    return True
+        except Exception as e:
+            logging.error(f"Error adding URLs {urls}: {e}")
+            return False
+
     def get_active_urls(self) -> list:
         """Get all active URLs to monitor"""
         with psycopg2.connect(self.connection_string) as conn:
@@ -102,16 +135,87 @@ class DatabaseManager:
                 result = cur.fetchone()
                 return result is None or result[0] != str(content_hash)
 
-    def update_content_record(self, url: str, content_hash: str, title: str, content: str):
-        """Update content record"""
+    def update_content_record(self, url: str, content_hash: str, title: str, content: str,
+                              source_url: Optional[str] = None):
+        """Update content record (source_url: the monitored URL it was found through, if not url itself)"""
         with psycopg2.connect(self.connection_string) as conn:
             with conn.cursor() as cur:
                 cur.execute("""
-                    INSERT INTO content_records (url, title, content_hash, content)
-                    VALUES (%s, %s, %s, %s)
-                """, (url, title, str(content_hash), content))
+                    INSERT INTO content_records (url, title, content_hash, content, source_url)
+                    VALUES (%s, %s, %s, %s,
+                            (SELECT url FROM monitored_urls WHERE url = %s))
+                """, (url, title, str(content_hash), content, source_url or url))
                 conn.commit()
 
+    def get_latest_content_hashes(self, urls: list) -> dict:
+        """Get the most recently stored content hash for each of the given URLs"""
+        if not urls:
+            return {}
+
+        with psycopg2.connect(self.connection_string) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT DISTINCT ON (url) url, content_hash
+                    FROM content_records
+                    WHERE url = ANY(%s)
+                    ORDER BY url, retrieved_at DESC
+                """, (list(urls),))
+
+                return dict(cur.fetchall())
+
+    def bulk_insert_content_records(self, records: list) -> int:
+        """Insert (url, content_hash, title, content, source_url) records in a single statement
+
+        source_url is the monitored URL the content was found through (the feed or
+        blog index for its entries and posts). It is left empty when that URL is no
+        longer monitored, rather than failing the whole insert on the foreign key.
+        """
+        if not records:
+            return 0
+
+        with psycopg2.connect(self.connection_string) as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    INSERT INTO content_records (url, title, content_hash, content, source_url)
+                    SELECT v.url, v.title, v.content_hash, v.content, m.url
+                    FROM (VALUES %s) AS v (url, title, content_hash, content, source_url)
+                    LEFT JOIN monitored_urls m ON m.url = v.source_url
+                """, [(url, title, str(content_hash), content, source_url)
+                      for url, content_hash, title, content, source_url in records])
+                conn.commit()
+
+        return len(records)
+
+    def get_latest_content_id(self) -> int:
+        """Get the id of the newest content record (0 if none), which changes whenever content is added"""
+        with psycopg2.connect(self.connection_string) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT COALESCE(MAX(id), 0) FROM content_records")
+                return cur.fetchone()[0]
+
+    def get_admin_stats(self) -> dict:
+        """Get the (estimated) total content count and today's query count in one query"""
+        try:
+            with psycopg2.connect(self.connection_string) as conn:
+                with conn.cursor() as cur:
+                    # The content count comes from the planner's row estimate, which is
+                    # kept current by autovacuum, instead of scanning the whole table;
+                    # a table that was never analyzed (reltuples is -1 on PostgreSQL 14+,
+                    # 0 on older servers) or has no pages yet is counted directly
+                    cur.execute("""
+                        SELECT
+                            (SELECT CASE WHEN reltuples <= 0 OR relpages = 0
+                                         THEN (SELECT COUNT(*) FROM content_records)
+                                         ELSE reltuples::bigint END
+                             FROM pg_class WHERE oid = 'content_records'::regclass),
+                            (SELECT COUNT(*) FROM query_logs WHERE created_at >= CURRENT_DATE)
+                    """)
+                    content_count, queries_today = cur.fetchone()
+                    return {"content_count": content_count, "queries_today": queries_today}
+        except Exception as e:
+            logging.error(f"Error getting admin stats: {e}")
+            return {"content_count": None, "queries_today": None}
+
     def get_content_since(self, since_date: datetime, topic_filter: Optional[str] = None) -> list:
         """Get content since specified date"""
         with psycopg2.connect(self.connection_string) as conn:
@@ -2,69 +2,340 @@
 import chromadb
 from chromadb.config import Settings
 from langchain_chroma import Chroma
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+import asyncio
+import contextlib
+import functools
+import heapq
 import logging
+import math
 import os
+import secrets
+import shutil
+import sys
+import threading
+import time
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
-import uuid
+
+import faiss
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux ioctl request that makes a file share another file's data blocks (copy-on-write)
+_FICLONE = 0x40049409
+
+@functools.lru_cache(maxsize=8)
+def _text_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """Shared text splitter per (chunk_size, chunk_overlap); splitters hold no per-call state"""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=["\n\n", "\n", " ", ""]
+    )
+
+def _copy_file(src: str, dst: str) -> str:
+    """Copy a file as a copy-on-write clone where the filesystem supports it, else a regular copy"""
+    if fcntl is not None and sys.platform.startswith('linux'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            # Not supported here (e.g. ext4, different filesystems); copy the data instead
+            pass
+    return shutil.copy2(src, dst)
+
+class _BoundedFileStore(LocalFileStore):
+    """LocalFileStore holding at most max_entries files, evicting the least recently used
+
+    Recency is tracked in memory, seeded once from the files' modification times,
+    so reads and writes don't scan the directory. Files written by another process
+    sharing the directory are only picked up on the next start.
+    """
+
+    def __init__(self, root_path: str, max_entries: int):
+        super().__init__(root_path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._recent = OrderedDict()
+
+        entries = []
+        for directory, _, files in os.walk(self.root_path):
+            for name in files:
+                path = os.path.join(directory, name)
+                with contextlib.suppress(FileNotFoundError):
+                    entries.append((os.stat(path).st_mtime_ns, os.path.relpath(path, self.root_path)))
+        for _, key in sorted(entries):
+            self._recent[key] = None
+        self._evict()
+
+    def mget(self, keys):
+        values = []
+        for key in keys:
+            path = self._get_full_path(key)
+            try:
+                values.append(path.read_bytes())
+                # Keeps the order seeded on the next start close to the order of use
+                os.utime(path)
+            except FileNotFoundError:
+                # Missing, or evicted by another process
+                values.append(None)
+
+        with self._lock:
+            for key, value in zip(keys, values):
+                if value is not None:
+                    self._recent[key] = None
+                    self._recent.move_to_end(key)
+        self._evict()
+        return values
+
+    def mset(self, key_value_pairs) -> None:
+        super().mset(key_value_pairs)
+        with self._lock:
+            for key, _ in key_value_pairs:
+                self._recent[key] = None
+                self._recent.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        """Remove the least recently used files beyond max_entries"""
+        with self._lock:
+            evicted = [self._recent.popitem(last=False)[0]
+                       for _ in range(len(self._recent) - self.max_entries)]
+        # Another process may have removed the files already
+        for key in evicted:
+            with contextlib.suppress(FileNotFoundError):
+                self._get_full_path(key).unlink()
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._recent.clear()
+        shutil.rmtree(self.root_path, ignore_errors=True)
 
 class VectorStoreManager:
     def __init__(self, persist_directory: str = "./data/vector_store",
                  collection_name: str = "ai_assistant_docs",
-                 google_api_key: str = ''):
+                 google_api_key: str = '', backend: str = "chroma",
+                 pq_threshold: int = 50_000, embedding_cache_size: int = 4096):
         """
-        Initialize Vector Store Manager with ChromaDB
+        Initialize Vector Store Manager with ChromaDB or a FAISS HNSW index
 
         Args:
             persist_directory: Directory to persist the vector database
             collection_name: Name of the collection to use
             google_api_key: Google API key for embeddings
+            backend: "chroma" (default) or "faiss"
+            pq_threshold: Vector count above which the FAISS index is rebuilt with
+                product quantization (IVF-PQ) to save memory
+            embedding_cache_size: Maximum number of document embeddings cached on disk
         """
+        if backend not in ("chroma", "faiss"):
+            raise ValueError(f"Unknown vector store backend: {backend}")
+
         self.persist_directory = persist_directory
         self.collection_name = collection_name
+        self.backend = backend
+        self.pq_threshold = pq_threshold
         self.logger = logging.getLogger(__name__)
 
         # Ensure directory exists
         os.makedirs(persist_directory, exist_ok=True)
 
-        # Initialize embeddings
-        self.embeddings = GoogleGenerativeAIEmbeddings(model='models/embedding-001')
+        # Initialize embeddings, caching document embeddings on disk by content hash
+        # so re-adding unchanged chunks doesn't call the embedding API again. The cache
+        # sits beside the persist directory so collection backups don't copy it
+        self._embedding_cache = _BoundedFileStore(
+            f"{os.path.normpath(persist_directory)}_embedding_cache", embedding_cache_size
+        )
+        self.embeddings = CacheBackedEmbeddings.from_bytes_store(
+            GoogleGenerativeAIEmbeddings(model='models/embedding-001'),
+            self._embedding_cache,
+            namespace='models/embedding-001',
+            key_encoder='blake2b'
+        )
 
         # Initialize text splitter
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""]
-        )
+        self.text_splitter = _text_splitter(chunk_size=1000, chunk_overlap=200)
+
+        if backend == "faiss":
+            # The LangChain FAISS wrapper is not safe for concurrent writes; additions
+            # are kept until persist() saves them, to be replayed if another process
+            # sharing the directory saved in the meantime
+            self.client = None
+            self._faiss_lock = threading.Lock()
+            self._faiss_pending = []
+            with self._faiss_file_lock():
+                self.vectorstore = self._load_faiss_store()
+        else:
+            # Initialize ChromaDB client
+            self.client = chromadb.PersistentClient(
+                path=persist_directory,
+                settings=Settings(
+                    anonymized_telemetry=False,
+                    allow_reset=True
+                )
+            )
 
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
-            path=persist_directory,
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
+            # Initialize Langchain Chroma wrapper
+            self.vectorstore = Chroma(
+                client=self.client,
+                collection_name=collection_name,
+                embedding_function=self.embeddings,
+                persist_directory=persist_directory
             )
-        )
 
-        # Initialize Langchain Chroma wrapper
-        self.vectorstore = Chroma(
-            client=self.client,
-            collection_name=collection_name,
+        self.logger.info(f"Vector store ({backend}) initialized at {persist_directory}")
+
+    @property
+    def _faiss_directory(self) -> str:
+        return os.path.join(self.persist_directory, "faiss")
+
+    @property
+    def _faiss_index_file(self) -> str:
+        return os.path.join(self._faiss_directory, f"{self.collection_name}.faiss")
+
+    @contextlib.contextmanager
+    def _faiss_file_lock(self):
+        """Hold an exclusive lock on the saved FAISS index across processes"""
+        if fcntl is None:
+            yield
+            return
+
+        # Kept outside the index directory, which reset_collection removes
+        lock_path = os.path.join(self.persist_directory, f"{self.collection_name}.faiss.lock")
+        with open(lock_path, "a") as lock_file:
+            # Released when the file is closed
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _saved_index_mtime(self) -> Optional[int]:
+        """Modification time of the saved FAISS index, or None if there is none"""
+        try:
+            return os.stat(self._faiss_index_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load_faiss_store(self) -> FAISS:
+        """Load the saved FAISS index and docstore, or create an empty HNSW index"""
+        # Compared in persist() to tell whether another process saved since
+        self._faiss_loaded_mtime = self._saved_index_mtime()
+        if self._faiss_loaded_mtime is not None:
+            # The pickled docstore is written by this class, not taken from outside
+            return FAISS.load_local(self._faiss_directory, self.embeddings,
+                                    index_name=self.collection_name,
+                                    allow_dangerous_deserialization=True)
+
+        # Embedding dimension from a probe text; document embeddings are cached
+        # on disk, so the API is only called for this once
+        dim = len(self.embeddings.embed_documents(["dimension probe"])[0])
+
+        index = faiss.IndexHNSWFlat(dim, 32)
+        index.hnsw.efConstruction = 200
+        index.hnsw.efSearch = 64
+
+        return FAISS(
             embedding_function=self.embeddings,
-            persist_directory=persist_directory
+            index=index,
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={}
         )
 
-        self.logger.info(f"Vector store initialized at {persist_directory}")
+    def _add_to_store(self, method: str, *args, **kwargs) -> List[str]:
+        """Call a vectorstore add method, recording the addition for persist() with FAISS"""
+        if self.backend != "faiss":
+            return getattr(self.vectorstore, method)(*args, **kwargs)
+
+        with self._faiss_lock:
+            ids = getattr(self.vectorstore, method)(*args, **kwargs)
+            # Replayed with the same ids if the index has to be reloaded before saving
+            self._faiss_pending.append((method, args, {**kwargs, 'ids': ids}))
+            return ids
+
+    def persist(self) -> bool:
+        """
+        Save the FAISS additions made since the last call (Chroma writes through already)
 
-    def add_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
+        Called once per batch rather than after every add, as each save rewrites the
+        whole index. If another process sharing the directory saved in the meantime,
+        its index is reloaded and this process's additions are replayed onto it
+        (their embeddings come from the cache) so neither overwrites the other.
+
+        Returns:
+            Success status
+        """
+        if self.backend != "faiss":
+            return True
+
+        try:
+            with self._faiss_lock, self._faiss_file_lock():
+                if not self._faiss_pending:
+                    return True
+
+                if self._saved_index_mtime() != self._faiss_loaded_mtime:
+                    self.vectorstore = self._load_faiss_store()
+                    for method, args, kwargs in self._faiss_pending:
+                        getattr(self.vectorstore, method)(*args, **kwargs)
+
+                if (isinstance(self.vectorstore.index, faiss.IndexHNSWFlat)
+                        and self.vectorstore.index.ntotal > self.pq_threshold):
+                    self.vectorstore.index = self._build_pq_index(self.vectorstore.index)
+
+                self.vectorstore.save_local(self._faiss_directory, index_name=self.collection_name)
+                self._faiss_loaded_mtime = self._saved_index_mtime()
+                self._faiss_pending.clear()
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error saving FAISS index: {e}")
+            return False
+
+    def _build_pq_index(self, index: faiss.Index) -> faiss.Index:
+        """Rebuild an index as IVF-PQ, keeping vector positions so docstore ids still match"""
+        vectors = index.reconstruct_n(0, index.ntotal)
+        dim = index.d
+
+        # About 4 dimensions per 8-bit sub-quantizer, so each float32 vector shrinks from
+        # 4*dim bytes to m bytes (about a 16x reduction); m has to divide the dimension
+        m = max(d for d in range(1, max(dim // 4, 1) + 1) if dim % d == 0)
+        nlist = int(4 * math.sqrt(index.ntotal))
+
+        pq_index = faiss.IndexIVFPQ(faiss.IndexFlatL2(dim), dim, nlist, m, 8)
+        # Polysemous codes only help Hamming-filtered search, which isn't used,
+        # and training them dominates build time
+        pq_index.do_polysemous_training = False
+        pq_index.train(vectors)
+        pq_index.add(vectors)
+        pq_index.nprobe = 16
+
+        self.logger.info(f"Compressed {index.ntotal} vectors into an IVF{nlist},PQ{m} index")
+        return pq_index
+
+    def _faiss_unsupported(self, operation: str) -> bool:
+        """Log an operation the FAISS HNSW backend cannot perform"""
+        self.logger.error(f"{operation} is not supported by the FAISS backend "
+                          "(HNSW indexes cannot remove vectors)")
+        return False
+
+    def add_documents(self, documents: List[Dict[str, Any]], batch_size: int = 500) -> List[str]:
         """
         Add documents to the vector store
 
         Args:
             documents: List of document dictionaries with 'content', 'metadata', etc.
+            batch_size: Maximum number of chunks embedded and written per vector store call
 
         Returns:
             List of document IDs
@@ -97,8 +368,13 @@ class VectorStoreManager:
                         metadata=chunk_metadata
                     ))
 
-            # Add documents to vector store
-            ids = self.vectorstore.add_documents(doc_objects)
+            # Add documents to vector store; each call embeds its whole batch in one
+            # request, and bounding the batch keeps writes under Chroma's max batch size
+            ids = []
+            for start in range(0, len(doc_objects), batch_size):
+                ids.extend(self._add_to_store('add_documents',
+                                              doc_objects[start:start + batch_size]))
+            self.persist()
 
             self.logger.info(f"Added {len(doc_objects)} document chunks to vector store")
             return ids
@@ -111,6 +387,8 @@ class VectorStoreManager:
         """
         Add texts directly to the vector store
 
+        With the FAISS backend the additions are saved by the next persist() call.
+
         Args:
             texts: List of text strings
             metadatas: List of metadata dictionaries
@@ -122,11 +400,15 @@ class VectorStoreManager:
             if metadatas is None:
                 metadatas = [{}] * len(texts)
 
-            # Generate unique IDs
-            ids = [str(uuid.uuid4()) for _ in texts]
+            # Generate unique, time-ordered IDs: a shared nanosecond timestamp prefix
+            # plus a random suffix per text, all drawn from one token_bytes call
+            prefix = f"{time.time_ns():016x}"
+            suffixes = secrets.token_bytes(8 * len(texts)).hex()
+            ids = [f"{prefix}{suffixes[i * 16:(i + 1) * 16]}" for i in range(len(texts))]
 
             # Add to vector store
-            self.vectorstore.add_texts(
+            ids = self._add_to_store(
+                'add_texts',
                 texts=texts,
                 metadatas=metadatas,
                 ids=ids
@@ -172,6 +454,27 @@ class VectorStoreManager:
             self.logger.error(f"Error in similarity search: {e}")
             return []
 
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 5) -> List[Document]:
+        """
+        Perform similarity search with an already computed query embedding
+
+        Args:
+            embedding: Query embedding
+            k: Number of results to return
+
+        Returns:
+            List of similar documents
+        """
+        try:
+            results = self.vectorstore.similarity_search_by_vector(embedding=embedding, k=k)
+
+            self.logger.debug(f"Found {len(results)} similar documents for query embedding")
+            return results
+
+        except Exception as e:
+            self.logger.error(f"Error in similarity search by vector: {e}")
+            return []
+
     def similarity_search_with_score(self, query: str, k: int = 5) -> List[tuple]:
         """
         Perform similarity search with relevance scores
@@ -196,6 +499,44 @@ class VectorStoreManager:
             self.logger.error(f"Error in similarity search with score: {e}")
             return []
 
+    async def similarity_search_multi(self, query: str, filters: List[Dict],
+                                      k: int = 5) -> List[tuple]:
+        """
+        Run one scored similarity search per metadata filter concurrently
+
+        Args:
+            query: Search query
+            filters: Metadata filters, one search per filter
+            k: Number of results to return overall
+
+        Returns:
+            The k closest (document, score) tuples across all filters
+        """
+        try:
+            branches = await asyncio.gather(*(
+                asyncio.to_thread(
+                    self.vectorstore.similarity_search_with_score,
+                    query=query,
+                    k=k,
+                    filter=filter_dict
+                )
+                for filter_dict in filters
+            ))
+
+            # Chroma and FAISS scores are distances, so the best matches have the lowest scores
+            results = heapq.nsmallest(
+                k,
+                (result for branch in branches for result in branch),
+                key=lambda result: result[1]
+            )
+
+            self.logger.debug(f"Found {len(results)} scored results across {len(filters)} filters for query: {query[:50]}...")
+            return results
+
+        except Exception as e:
+            self.logger.error(f"Error in multi-filter similarity search: {e}")
+            return []
+
     def delete_documents(self, ids: List[str]) -> bool:
         """
         Delete documents by IDs
@@ -206,6 +547,9 @@ class VectorStoreManager:
         Returns:
             Success status
         """
+        if self.backend == "faiss":
+            return self._faiss_unsupported("Deleting documents")
+
         try:
             self.vectorstore.delete(ids=ids)
             self.logger.info(f"Deleted {len(ids)} documents from vector store")
@@ -225,18 +569,15 @@ class VectorStoreManager:
         Returns:
             Success status
         """
+        if self.backend == "faiss":
+            return self._faiss_unsupported("Deleting by metadata")
+
         try:
-            # First, find documents matching the filter
+            # Let Chroma match and delete in one call instead of fetching the ids first
             collection = self.client.get_collection(self.collection_name)
-            results = collection.get(where=filter_dict)
-
-            if results['ids']:
-                collection.delete(ids=results['ids'])
-                self.logger.info(f"Deleted {len(results['ids'])} documents matching filter")
-                return True
-            else:
-                self.logger.info("No documents found matching the filter")
-                return True
+            collection.delete(where=filter_dict)
+            self.logger.info(f"Deleted documents matching filter {filter_dict}")
+            return True
 
         except Exception as e:
             self.logger.error(f"Error deleting documents by metadata: {e}")
@@ -255,6 +596,9 @@ class VectorStoreManager:
         Returns:
             Success status
         """
+        if self.backend == "faiss":
+            return self._faiss_unsupported("Updating documents")
+
         try:
             collection = self.client.get_collection(self.collection_name)
 
@@ -288,11 +632,16 @@ class VectorStoreManager:
             Dictionary with collection statistics
         """
         try:
-            collection = self.client.get_collection(self.collection_name)
-            count = collection.count()
+            if self.backend == "faiss":
+                count = self.vectorstore.index.ntotal
+                docs = self.vectorstore.docstore._dict.values()
+                sample = {'metadatas': [doc.metadata for _, doc in zip(range(10), docs)]}
+            else:
+                collection = self.client.get_collection(self.collection_name)
+                count = collection.count()
 
-            # Get sample of metadata to understand structure
-            sample = collection.peek(limit=10)
+                # Get sample of metadata to understand structure
+                sample = collection.peek(limit=10)
 
             # Count documents by source URL if available
             url_counts = {}
@@ -312,6 +661,36 @@ class VectorStoreManager:
             self.logger.error(f"Error getting collection stats: {e}")
             return {}
 
+    def warmup(self) -> bool:
+        """
+        Load the collection's index into memory ahead of the first query
+
+        Runs one nearest-neighbour query using a stored embedding, so no
+        embedding API call is made
+
+        Returns:
+            True if a warmup query ran, False if the collection is empty or it failed
+        """
+        if self.backend == "faiss":
+            # FAISS indexes are read fully into memory when loaded
+            return False
+
+        try:
+            collection = self.client.get_collection(self.collection_name)
+            sample = collection.get(limit=1, include=['embeddings'])
+            embeddings = sample.get('embeddings')
+
+            if embeddings is None or len(embeddings) == 0:
+                return False
+
+            collection.query(query_embeddings=[embeddings[0]], n_results=1)
+            self.logger.info(f"Warmed up collection {self.collection_name}")
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"Error warming up collection: {e}")
+            return False
+
     def as_retriever(self, search_kwargs: Dict = None):
         """
         Return the vector store as a LangChain retriever
@@ -333,6 +712,16 @@ class VectorStoreManager:
             Success status
         """
         try:
+            self._embedding_cache.clear()
+
+            if self.backend == "faiss":
+                with self._faiss_lock, self._faiss_file_lock():
+                    shutil.rmtree(self._faiss_directory, ignore_errors=True)
+                    self._faiss_pending.clear()
+                    self.vectorstore = self._load_faiss_store()
+                self.logger.info(f"Reset collection {self.collection_name}")
+                return True
+
             self.client.delete_collection(self.collection_name)
             # Recreate the collection
             self.vectorstore = Chroma(
@@ -359,8 +748,15 @@ class VectorStoreManager:
             Success status
         """
         try:
-            import shutil
-            shutil.copytree(self.persist_directory, backup_path, dirs_exist_ok=True)
+            # Files are cloned rather than copied on reflink-capable filesystems (btrfs, XFS);
+            # FAISS saves, here or in other processes, are held off so the saved index
+            # and docstore stay in step
+            with contextlib.ExitStack() as stack:
+                if self.backend == "faiss":
+                    stack.enter_context(self._faiss_lock)
+                    stack.enter_context(self._faiss_file_lock())
+                shutil.copytree(self.persist_directory, backup_path, dirs_exist_ok=True,
+                                copy_function=_copy_file)
             self.logger.info(f"Collection backed up to {backup_path}")
             return True
 
@@ -45,7 +45,8 @@ class AIAssistantApp:
             # Vector Store
             self.vector_store = VectorStoreManager(
                 persist_directory=self.config.vector_store_config['path'],
-                collection_name=self.config.vector_store_config['collection_name']
+                collection_name=self.config.vector_store_config['collection_name'],
+                backend=self.config.vector_store_config.get('backend', 'chroma')
             )
             self.logger.info("Vector store initialized")
 
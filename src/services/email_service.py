@@ -1,6 +1,8 @@
 # src/services/email_service.py
+import asyncio
 import smtplib
 import ssl
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -38,18 +40,31 @@ class EmailService:
         if not self.recipients:
             self.logger.warning("No email recipients configured")
 
+        # SMTP connection kept open between emails, guarded for use from worker threads
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+
         # Initialize Jinja2 template environment
         template_dir = Path(__file__).parent.parent / 'templates' / 'email'
         template_dir.mkdir(parents=True, exist_ok=True)
 
+        # Templates are compiled once and not re-checked on disk for every send
         self.jinja_env = jinja2.Environment(
             loader=jinja2.FileSystemLoader(str(template_dir)),
-            autoescape=jinja2.select_autoescape(['html', 'xml'])
+            autoescape=jinja2.select_autoescape(['html', 'xml']),
+            auto_reload=False
         )
 
         # Create default templates if they don't exist
         self._create_default_templates()
 
+        # Compile the templates up front so sends only render them
+        for template_name in ('daily_summary.html', 'topic_summary.html', 'alert.html'):
+            try:
+                self.jinja_env.get_template(template_name)
+            except jinja2.TemplateError as e:
+                self.logger.error(f"Error compiling template {template_name}: {e}")
+
         self.logger.info(f"Email service initialized for {len(self.recipients)} recipients")
 
     def _create_default_templates(self):
@@ -501,16 +516,8 @@ class EmailService:
                     else:
                         self.logger.warning(f"Attachment file not found: {file_path}")
 
-            # Create SMTP session
-            context = ssl.create_default_context()
-
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls(context=context)
-                server.login(self.username, self.password)
-
-                # Send email
-                text = msg.as_string()
-                server.sendmail(self.username, recipients, text)
+            # Send email over the shared SMTP connection without blocking the event loop
+            await asyncio.to_thread(self._deliver, recipients, msg.as_string())
 
             self.logger.info(f"Email sent successfully to {len(recipients)} recipients")
             return True
@@ -525,6 +532,52 @@ class EmailService:
             self.logger.error(f"Unexpected error sending email: {e}")
             return False
 
+    def _deliver(self, recipients: List[str], message: str):
+        """Send a message over the shared SMTP connection, opening it if needed"""
+        with self._smtp_lock:
+            try:
+                self._get_smtp().sendmail(self.username, recipients, message)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                # Connection went away mid-send; start fresh next time
+                self._close_smtp()
+                raise
+
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return the open SMTP connection, reconnecting if the server dropped it"""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
+
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30)
+        try:
+            server.starttls(context=ssl.create_default_context())
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+
+        self._smtp = server
+        return server
+
+    def _close_smtp(self):
+        """Close the shared SMTP connection, ignoring errors from a dead connection"""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+
+    def close(self):
+        """Close the SMTP connection kept open between emails"""
+        with self._smtp_lock:
+            self._close_smtp()
+
     def _render_template(self, template_name: str, data: Dict[str, Any]) -> str:
         """Render Jinja2 template with data"""
         try:
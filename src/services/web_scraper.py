@@ -1,17 +1,94 @@
 # src/services/web_scraper.py
 import aiohttp
 import asyncio
+import contextvars
+import copy
 import time
 import logging
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from typing import List, Dict, Optional, Set
 import hashlib
-from datetime import datetime
+import itertools
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import re
 import feedparser
 from readability import Document as ReadabilityDocument
 
+try:
+    import aiodns  # Backs aiohttp.AsyncResolver
+except ImportError:
+    aiodns = None
+
+_WS_RE = re.compile(r'\s+')
+
+
+class _CleanTextTable(dict):
+    """Translation table for _clean_text, filled lazily per code point.
+
+    Word characters, whitespace and basic punctuation map to themselves;
+    everything else maps to a space.
+    """
+
+    _KEEP_PUNCTUATION = frozenset('_.,!?;:-()')
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        if char.isalnum() or char.isspace() or char in self._KEEP_PUNCTUATION:
+            value = char
+        else:
+            value = ' '
+        self[codepoint] = value
+        return value
+
+
+_CLEAN_TEXT_TABLE = _CleanTextTable()
+
+_WORD_RE = re.compile(r'\S+')
+
+
+class _ScrapeResult(dict):
+    """Scrape result whose content_hash and word_count are computed on first access"""
+
+    def __missing__(self, key):
+        if key == 'content_hash':
+            value = hashlib.md5(self['content'].encode()).hexdigest()
+        elif key == 'word_count':
+            value = sum(1 for _ in _WORD_RE.finditer(self['content']))
+        else:
+            raise KeyError(key)
+
+        self[key] = value
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+# Parsed results of the current scrape_multiple_urls batch, keyed by raw body hash
+_batch_results: contextvars.ContextVar[Optional[Dict[str, Dict]]] = contextvars.ContextVar(
+    '_batch_results', default=None
+)
+
+
+
+def _default_fd_budget() -> int:
+    """Half of the process file-descriptor soft limit, capped at 500"""
+    try:
+        import resource
+        soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, ValueError, OSError):
+        return 500  # No RLIMIT_NOFILE (e.g. Windows)
+
+    if soft_limit == resource.RLIM_INFINITY:
+        return 500
+
+    return max(1, min(500, soft_limit // 2))
+
 class WebScraper:
     def __init__(self, config: dict):
         """
@@ -29,6 +106,11 @@ class WebScraper:
         self.timeout = self.config.get('timeout', 30)
         self.max_retries = self.config.get('max_retries', 3)
         self.max_content_length = self.config.get('max_content_length', 1024 * 1024)  # 1MB
+        self.max_feed_entries = self.config.get('max_feed_entries', 10)
+        self.max_retry_after = self.config.get('max_retry_after', 60)  # seconds
+        self.max_open_connections = self.config.get('max_open_connections') or _default_fd_budget()
+        self.dns_cache_ttl = self.config.get('dns_cache_ttl', 300)  # seconds
+        self.dns_nameservers = self.config.get('dns_nameservers')  # None uses the system resolvers
 
         # Headers for requests
         self.headers = {
@@ -86,7 +168,8 @@ class WebScraper:
             timeout = aiohttp.ClientTimeout(total=self.timeout)
             session = aiohttp.ClientSession(
                 headers=self.headers,
-                timeout=timeout
+                timeout=timeout,
+                connector=self._create_connector()
             )
             should_close_session = True
 
@@ -118,8 +201,12 @@ class WebScraper:
         Returns:
             List of scraping results
         """
+        # Drop duplicate URLs while preserving order
+        urls = list(dict.fromkeys(urls))
+
         timeout = aiohttp.ClientTimeout(total=self.timeout)
-        connector = aiohttp.TCPConnector(limit=max_concurrent)
+        # max_concurrent gates fetch+parse work; the connector caps open sockets at the fd budget
+        connector = self._create_connector(limit=self.max_open_connections)
 
         async with aiohttp.ClientSession(
             headers=self.headers,
@@ -127,6 +214,8 @@ class WebScraper:
             connector=connector
         ) as session:
 
+            # Share parsed results between mirrors serving identical bodies
+            batch_token = _batch_results.set({})
             semaphore = asyncio.Semaphore(max_concurrent)
 
             async def scrape_with_semaphore(url):
@@ -135,7 +224,10 @@ class WebScraper:
                     return await self.scrape_url(url, session)
 
             tasks = [scrape_with_semaphore(url) for url in urls]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                _batch_results.reset(batch_token)
 
             # Handle exceptions in results
             processed_results = []
@@ -152,6 +244,33 @@ class WebScraper:
 
             return processed_results
 
+    def _create_connector(self, limit: int = 100) -> aiohttp.TCPConnector:
+        """
+        Create a TCP connector with DNS caching
+
+        Uses aiodns for non-blocking lookups when it is installed, otherwise
+        aiohttp's default thread-pool resolver.
+
+        Args:
+            limit: Maximum number of simultaneous connections
+
+        Returns:
+            Configured TCP connector
+        """
+        resolver = None
+        if aiodns is not None:
+            if self.dns_nameservers:
+                resolver = aiohttp.AsyncResolver(nameservers=self.dns_nameservers)
+            else:
+                resolver = aiohttp.AsyncResolver()
+
+        return aiohttp.TCPConnector(
+            limit=limit,
+            resolver=resolver,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl
+        )
+
     async def _scrape_with_retries(self, url: str,
                                   session: aiohttp.ClientSession) -> Dict:
         """
@@ -165,13 +284,32 @@ class WebScraper:
             Scraping result dictionary
         """
         last_exception = None
+        retry_after = None
 
         for attempt in range(self.max_retries):
             try:
                 if attempt > 0:
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                    await asyncio.sleep(self._retry_delay(attempt, retry_after))
+                    retry_after = None
 
                 async with session.get(url) as response:
+                    # Client errors other than 408/429 will not succeed on retry
+                    if response.status >= 400:
+                        last_exception = f"HTTP {response.status}"
+                        if response.status in (429, 503):
+                            retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+                        elif response.status < 500 and response.status != 408:
+                            return {
+                                'url': url,
+                                'success': False,
+                                'error': f'HTTP error: {response.status}',
+                                'status_code': response.status,
+                                'timestamp': datetime.now().isoformat()
+                            }
+
+                        self.logger.warning(f"HTTP {response.status} scraping {url}, attempt {attempt + 1}")
+                        continue
+
                     # Check content type
                     content_type = response.headers.get('content-type', '').lower()
                     if not any(ct in content_type for ct in self.accepted_content_types):
@@ -195,11 +333,24 @@ class WebScraper:
                     # Read content
                     content = await response.text()
 
+                    # Reuse the parse of an identical body seen earlier in this batch
+                    batch_results = _batch_results.get()
+                    body_hash = None
+                    if batch_results is not None:
+                        body_hash = hashlib.md5(content.encode()).hexdigest()
+                        if body_hash in batch_results:
+                            return self._reuse_result(batch_results[body_hash], url, response)
+
                     # Process content based on type
                     if 'xml' in content_type or 'rss' in content_type or 'atom' in content_type:
-                        return await self._process_feed_content(url, content, response)
+                        result = await self._process_feed_content(url, content, response)
                     else:
-                        return await self._process_html_content(url, content, response)
+                        result = await self._process_html_content(url, content, response)
+
+                    if batch_results is not None and result['success']:
+                        batch_results[body_hash] = result
+
+                    return result
 
             except asyncio.TimeoutError:
                 last_exception = f"Timeout after {self.timeout} seconds"
@@ -221,6 +372,46 @@ class WebScraper:
             'timestamp': datetime.now().isoformat()
         }
 
+    @staticmethod
+    def _reuse_result(result: Dict, url: str, response: aiohttp.ClientResponse) -> Dict:
+        """Copy a parsed result for another URL, rebuilding the fields that depend on the URL or response"""
+        reused = copy.copy(result)
+        reused['url'] = url
+        reused['status_code'] = response.status
+        reused['metadata'] = dict(result['metadata'])
+        if 'domain' in reused['metadata']:
+            parsed_url = urlparse(url)
+            reused['metadata'].update(domain=parsed_url.netloc, path=parsed_url.path)
+        if 'headers' in result:
+            reused['headers'] = dict(response.headers)
+        return reused
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before a retry: Retry-After when given, else exponential backoff, plus jitter"""
+        delay = 2 ** attempt if retry_after is None else min(retry_after, self.max_retry_after)
+        return delay + random.uniform(0, 0.5)
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given either in seconds or as an HTTP date"""
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
     async def _process_html_content(self, url: str, content: str,
                                   response: aiohttp.ClientResponse) -> Dict:
         """
@@ -237,9 +428,12 @@ class WebScraper:
         try:
             soup = BeautifulSoup(content, 'html.parser')
 
+            # Collect <meta>, <title>, <h1> and <time> data in one tree walk
+            page_elements = self._index_page_elements(soup)
+
             # Extract basic metadata
-            title = self._extract_title(soup)
-            description = self._extract_description(soup)
+            title = self._extract_title(page_elements)
+            description = self._extract_description(page_elements)
 
             # Try to extract main content using readability
             main_content = self._extract_main_content_readability(content)
@@ -251,25 +445,21 @@ class WebScraper:
             # Clean and process text
             clean_content = self._clean_text(main_content)
 
-            # Generate content hash for deduplication
-            content_hash = hashlib.md5(clean_content.encode()).hexdigest()
-
             # Extract additional metadata
-            metadata = self._extract_metadata(soup, url)
+            metadata = self._extract_metadata(soup, url, page_elements)
 
-            return {
+            # content_hash and word_count are computed when first read
+            return _ScrapeResult({
                 'url': url,
                 'success': True,
                 'title': title,
                 'description': description,
                 'content': clean_content,
-                'content_hash': content_hash,
-                'word_count': len(clean_content.split()),
                 'metadata': metadata,
                 'timestamp': datetime.now().isoformat(),
                 'status_code': response.status,
                 'headers': dict(response.headers)
-            }
+            })
 
         except Exception as e:
             self.logger.error(f"Error processing HTML content from {url}: {e}")
@@ -294,7 +484,9 @@ class WebScraper:
             Processed feed dictionary
         """
         try:
-            feed = feedparser.parse(content)
+            # Entry text goes through _clean_text, so skip feedparser's
+            # relative-URI resolution and HTML sanitizing passes
+            feed = feedparser.parse(content, resolve_relative_uris=False, sanitize_html=False)
 
             if feed.bozo:
                 self.logger.warning(f"Feed parsing issues for {url}: {feed.bozo_exception}")
@@ -307,7 +499,7 @@ class WebScraper:
             entries = []
             combined_content = []
 
-            for entry in feed.entries[:10]:  # Limit to recent 10 entries
+            for entry in itertools.islice(feed.entries, self.max_feed_entries):  # Limit to recent entries
                 entry_data = {
                     'title': entry.get('title', 'No Title'),
                     'link': entry.get('link', ''),
@@ -322,16 +514,14 @@ class WebScraper:
                 combined_content.append(self._clean_text(entry_text))
 
             full_content = '\n\n'.join(combined_content)
-            content_hash = hashlib.md5(full_content.encode()).hexdigest()
 
-            return {
+            # content_hash and word_count are computed when first read
+            return _ScrapeResult({
                 'url': url,
                 'success': True,
                 'title': feed_title,
                 'description': feed_description,
                 'content': full_content,
-                'content_hash': content_hash,
-                'word_count': len(full_content.split()),
                 'feed_entries': entries,
                 'metadata': {
                     'type': 'feed',
@@ -340,7 +530,7 @@ class WebScraper:
                 },
                 'timestamp': datetime.now().isoformat(),
                 'status_code': response.status
-            }
+            })
 
         except Exception as e:
             self.logger.error(f"Error processing feed content from {url}: {e}")
@@ -351,42 +541,62 @@ class WebScraper:
                 'timestamp': datetime.now().isoformat()
             }
 
-    def _extract_title(self, soup: BeautifulSoup) -> str:
+    def _index_page_elements(self, soup: BeautifulSoup) -> Dict:
+        """Index <meta>, <title>, <h1> and <time> elements in a single pass over the tree"""
+        page_elements = {
+            'meta_name': {},
+            'meta_property': {},
+            'title': None,
+            'h1': None,
+            'time': None
+        }
+
+        for element in soup.find_all(['meta', 'title', 'h1', 'time']):
+            if element.name == 'meta':
+                content = element.get('content', '').strip()
+                name = element.get('name')
+                prop = element.get('property')
+                # Keep the first non-empty value, as a find() per key would
+                if name and content:
+                    page_elements['meta_name'].setdefault(name, content)
+                if prop and content:
+                    page_elements['meta_property'].setdefault(prop, content)
+            elif element.name == 'time':
+                if page_elements['time'] is None and element.get('datetime', '').strip():
+                    page_elements['time'] = element['datetime'].strip()
+            elif page_elements[element.name] is None:
+                page_elements[element.name] = element.get_text().strip()
+
+        return page_elements
+
+    def _extract_title(self, page_elements: Dict) -> str:
         """Extract page title"""
         # Try multiple title sources
         title_sources = [
-            soup.find('title'),
-            soup.find('h1'),
-            soup.find('meta', property='og:title'),
-            soup.find('meta', name='twitter:title')
+            page_elements['title'],
+            page_elements['h1'],
+            page_elements['meta_property'].get('og:title'),
+            page_elements['meta_name'].get('twitter:title')
         ]
 
-        for source in title_sources:
-            if source:
-                if source.name == 'meta':
-                    title = source.get('content', '').strip()
-                else:
-                    title = source.get_text().strip()
-
-                if title:
-                    return title[:200]  # Limit title length
+        for title in title_sources:
+            if title:
+                return title[:200]  # Limit title length
 
         return 'No Title'
 
-    def _extract_description(self, soup: BeautifulSoup) -> str:
+    def _extract_description(self, page_elements: Dict) -> str:
         """Extract page description"""
         # Try multiple description sources
         desc_sources = [
-            soup.find('meta', name='description'),
-            soup.find('meta', property='og:description'),
-            soup.find('meta', name='twitter:description')
+            page_elements['meta_name'].get('description'),
+            page_elements['meta_property'].get('og:description'),
+            page_elements['meta_name'].get('twitter:description')
         ]
 
-        for source in desc_sources:
-            if source:
-                desc = source.get('content', '').strip()
-                if desc:
-                    return desc[:500]  # Limit description length
+        for desc in desc_sources:
+            if desc:
+                return desc[:500]  # Limit description length
 
         return ''
 
@@ -432,73 +642,55 @@ class WebScraper:
         if not text:
             return ''
 
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Replace special characters with spaces but keep basic punctuation
+        text = text.translate(_CLEAN_TEXT_TABLE)
 
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)]', ' ', text)
+        # Collapse whitespace
+        return _WS_RE.sub(' ', text).strip()
 
-        # Remove extra spaces again
-        text = re.sub(r'\s+', ' ', text)
-
-        return text.strip()
-
-    def _extract_metadata(self, soup: BeautifulSoup, url: str) -> Dict:
+    def _extract_metadata(self, soup: BeautifulSoup, url: str, page_elements: Dict) -> Dict:
         """Extract additional metadata from the page"""
+        parsed_url = urlparse(url)
         metadata = {
-            'domain': urlparse(url).netloc,
-            'path': urlparse(url).path,
+            'domain': parsed_url.netloc,
+            'path': parsed_url.path,
         }
 
-        # Extract author
-        author_selectors = [
-            'meta[name="author"]',
-            'meta[property="article:author"]',
-            '.author',
-            '.byline'
-        ]
+        # Extract author, falling back to CSS selectors only when no meta tag matched
+        author = (page_elements['meta_name'].get('author')
+                  or page_elements['meta_property'].get('article:author'))
 
-        for selector in author_selectors:
-            element = soup.select_one(selector)
-            if element:
-                if element.name == 'meta':
-                    author = element.get('content', '').strip()
-                else:
+        if not author:
+            for selector in ['.author', '.byline']:
+                element = soup.select_one(selector)
+                if element:
                     author = element.get_text().strip()
+                    if author:
+                        break
 
-                if author:
-                    metadata['author'] = author
-                    break
+        if author:
+            metadata['author'] = author
 
         # Extract publication date
-        date_selectors = [
-            'meta[property="article:published_time"]',
-            'meta[name="date"]',
-            'time[datetime]',
-            '.date',
-            '.published'
-        ]
-
-        for selector in date_selectors:
-            element = soup.select_one(selector)
-            if element:
-                if element.name == 'meta':
-                    date = element.get('content', '').strip()
-                elif element.name == 'time':
-                    date = element.get('datetime', '').strip()
-                else:
+        date = (page_elements['meta_property'].get('article:published_time')
+                or page_elements['meta_name'].get('date')
+                or page_elements['time'])
+
+        if not date:
+            for selector in ['.date', '.published']:
+                element = soup.select_one(selector)
+                if element:
                     date = element.get_text().strip()
+                    if date:
+                        break
 
-                if date:
-                    metadata['published_date'] = date
-                    break
+        if date:
+            metadata['published_date'] = date
 
         # Extract keywords/tags
-        keywords_element = soup.find('meta', name='keywords')
-        if keywords_element:
-            keywords = keywords_element.get('content', '').strip()
-            if keywords:
-                metadata['keywords'] = [k.strip() for k in keywords.split(',')]
+        keywords = page_elements['meta_name'].get('keywords')
+        if keywords:
+            metadata['keywords'] = [k.strip() for k in keywords.split(',')]
 
         return metadata
 
@@ -1,5 +1,8 @@
 # src/utils/config_manager.py
 import yaml
+import copy
+import functools
+import json
 import os
 import re
 from pathlib import Path
@@ -10,6 +13,19 @@ import logging
 # This loads the variables from .env into the environment
 load_dotenv(dotenv_path=Path(__file__).parent.parent.parent / ".env")
 
+# Pattern to match ${VAR} or ${VAR:default}
+_ENV_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
+@functools.lru_cache(maxsize=32)
+def _parse_yaml(content: str) -> Dict[str, Any]:
+    """Parse YAML text, memoized on the env-substituted text so unchanged files skip the parser"""
+    return yaml.safe_load(content) or {}
+
+@functools.lru_cache(maxsize=32)
+def _parse_json(content: str) -> Dict[str, Any]:
+    """Parse JSON text, memoized on the env-substituted text"""
+    return json.loads(content) or {}
+
 class ConfigManager:
     """Configuration manager that loads settings from YAML and environment variables"""
 
@@ -21,7 +37,7 @@ class ConfigManager:
         self.logger.info(f"Configuration loaded from {config_path}")
 
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from YAML file with environment variable substitution"""
+        """Load configuration from a YAML (or .json) file with environment variable substitution"""
         try:
             with open(self.config_path, 'r', encoding='utf-8') as file:
                 content = file.read()
@@ -29,10 +45,9 @@ class ConfigManager:
             # Substitute environment variables
             content = self._substitute_env_vars(content)
 
-            # Parse YAML
-            config = yaml.safe_load(content)
-
-            return config or {}
+            # Parse JSON or YAML (copied so callers can't mutate the cached result)
+            parse = _parse_json if Path(self.config_path).suffix == '.json' else _parse_yaml
+            return copy.deepcopy(parse(content))
 
         except FileNotFoundError:
             self.logger.error(f"Configuration file not found: {self.config_path}")
@@ -57,9 +72,7 @@ class ConfigManager:
 
             return os.getenv(var_name, default_value)
 
-        # Pattern to match ${VAR} or ${VAR:default}
-        pattern = r'\$\{([^}]+)\}'
-        return re.sub(pattern, replace_var, content)
+        return _ENV_PATTERN.sub(replace_var, content)
 
     def get(self, key_path: str, default: Any = None) -> Any:
         """
@@ -4,30 +4,106 @@ import logging.handlers
 import os
 from pathlib import Path
 
-def setup_logging(log_level: str = "INFO"):
-    """Setup logging configuration"""
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_LOG_DIR = Path("logs")
 
-    # Create logs directory
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+# Level of the last completed setup_logging call, used to skip repeat calls
+_initialized_level = None
 
-    # Configure root logger
+class ByteCountingRotatingHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that tracks the file size in memory instead of seeking on every record"""
+
+    _bytes_written = 0
+    _pending_bytes = 0
+    # (record, message) formatted by shouldRollover, reused when emit writes it
+    _formatted = (None, None)
+
+    def _open(self):
+        stream = super()._open()
+        try:
+            self._bytes_written = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._bytes_written = 0
+        return stream
+
+    def shouldRollover(self, record) -> bool:
+        if self.stream is None:  # delay was set
+            self.stream = self._open()
+        if self.maxBytes <= 0:
+            self._pending_bytes = 0
+            return False
+
+        message = self.format(record)
+        self._formatted = (record, message)
+        self._pending_bytes = len((message + self.terminator).encode(self.encoding or 'utf-8',
+                                                                     errors='replace'))
+        return self._bytes_written + self._pending_bytes >= self.maxBytes
+
+    def format(self, record) -> str:
+        # emit() runs under the handler lock right after shouldRollover, so the
+        # record it writes is the one just formatted for the size check
+        formatted_record, message = self._formatted
+        if formatted_record is record:
+            return message
+        return super().format(record)
+
+    def emit(self, record):
+        try:
+            super().emit(record)
+            self._bytes_written += self._pending_bytes
+        finally:
+            self._formatted = (None, None)
+
+def setup_logging(log_level: str = "INFO", buffer_capacity: int = 512):
+    """Setup logging configuration (repeat calls with the same level are no-ops)
+
+    Logs always go to the console; set AI_LOG_TO_FILE to also write logs/ai_assistant.log.
+    """
+    global _initialized_level
+
+    level = getattr(logging, log_level.upper())
+    if _initialized_level == level:
+        return
+
+    # Console handler
+    handlers = [logging.StreamHandler()]
+
+    # File logging is opt-in so runs that don't need it skip the file entirely
+    if os.environ.get("AI_LOG_TO_FILE"):
+        # Create logs directory
+        _LOG_DIR.mkdir(exist_ok=True)
+
+        # File handler with rotation
+        file_handler = ByteCountingRotatingHandler(
+            _LOG_DIR / "ai_assistant.log",
+            maxBytes=50*1024*1024,  # 50MB
+            backupCount=5
+        )
+        # The buffer hands records straight to the target, so it needs its own formatter
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        # Buffer file records so request threads only append to a list; the flush still
+        # writes (and checks rollover for) each record. Warnings and errors flush
+        # immediately and logging.shutdown() flushes the rest at exit, so a hard kill
+        # loses at most the buffered INFO/DEBUG records
+        handlers.append(logging.handlers.MemoryHandler(
+            capacity=buffer_capacity,
+            flushLevel=logging.WARNING,
+            target=file_handler,
+            flushOnClose=True
+        ))
+
+    # Configure root logger, replacing handlers from any earlier call
     logging.basicConfig(
-        level=getattr(logging, log_level.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            # Console handler
-            logging.StreamHandler(),
-            # File handler with rotation
-            logging.handlers.RotatingFileHandler(
-                log_dir / "ai_assistant.log",
-                maxBytes=10*1024*1024,  # 10MB
-                backupCount=5
-            )
-        ]
+        level=level,
+        format=LOG_FORMAT,
+        handlers=handlers,
+        force=True
     )
 
     # Set specific loggers
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("chromadb").setLevel(logging.WARNING)
     logging.getLogger("google").setLevel(logging.WARNING)
+
+    _initialized_level = level
@@ -0,0 +1,106 @@
+# src/utils/semantic_cache.py
+import threading
+import time
+from typing import Any, List, Optional
+
+import faiss
+import numpy as np
+
+class SemanticCache:
+    """In-memory cache of query responses looked up by question embedding similarity"""
+
+    def __init__(self, threshold: float = 0.95, ttl_seconds: float = 300,
+                 max_entries: int = 1000):
+        """
+        Initialize the semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a cached question to count as a hit
+            ttl_seconds: How long a cached response stays valid
+            max_entries: Number of entries kept before least recently used ones are evicted
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        # Inner-product index over L2-normalized vectors, i.e. cosine similarity;
+        # created on first add once the embedding dimension is known
+        self.index = None
+        self._vectors: List[np.ndarray] = []
+        self._entries: List[dict] = []
+        self._lock = threading.Lock()
+
+    def lookup(self, embedding: List[float]) -> Optional[Any]:
+        """
+        Find the cached response for the most similar previous question
+
+        Args:
+            embedding: Embedding of the new question
+
+        Returns:
+            The cached response, or None when nothing is similar enough and unexpired
+        """
+        query = self._normalize(embedding)
+
+        with self._lock:
+            if self.index is None or self.index.ntotal == 0:
+                return None
+
+            scores, positions = self.index.search(query, 1)
+            score, position = scores[0][0], positions[0][0]
+            if position < 0 or score < self.threshold:
+                return None
+
+            entry = self._entries[position]
+            now = time.monotonic()
+            if now - entry['created_at'] > self.ttl_seconds:
+                return None
+
+            entry['last_used'] = now
+            return entry['response']
+
+    def add(self, embedding: List[float], response: Any):
+        """
+        Cache the response for a question
+
+        Args:
+            embedding: Embedding of the question
+            response: Response to return for similar questions
+        """
+        vector = self._normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            if self.index is None:
+                self.index = faiss.IndexFlatIP(vector.shape[1])
+
+            if len(self._entries) >= self.max_entries:
+                self._evict(now)
+
+            self.index.add(vector)
+            self._vectors.append(vector[0])
+            self._entries.append({'response': response, 'created_at': now, 'last_used': now})
+
+    def _evict(self, now: float):
+        """Drop expired entries, then the least recently used ones, and rebuild the index"""
+        live = [i for i, entry in enumerate(self._entries)
+                if now - entry['created_at'] <= self.ttl_seconds]
+        # Keep room for new entries so the rebuild doesn't run on every add
+        keep = self.max_entries // 2
+        if len(live) > keep:
+            live = sorted(live, key=lambda i: self._entries[i]['last_used'])[-keep:]
+            live.sort()
+
+        self._vectors = [self._vectors[i] for i in live]
+        self._entries = [self._entries[i] for i in live]
+
+        self.index.reset()
+        if self._vectors:
+            self.index.add(np.stack(self._vectors))
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """Convert an embedding to a normalized float32 row vector"""
+        vector = np.array([embedding], dtype=np.float32)
+        faiss.normalize_L2(vector)
+        return vector
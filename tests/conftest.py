@@ -1,16 +1,16 @@
 # tests/conftest.py
 import pytest
 import asyncio
-import tempfile
+import copy
 import shutil
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, MagicMock, patch
 import yaml
+import json
+import logging
+from collections.abc import Mapping
 from datetime import datetime
-
-# Add src to path
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from types import MappingProxyType
 
 from utils.config_manager import ConfigManager
 from data.database import DatabaseManager
@@ -18,6 +18,19 @@ from data.vector_store import VectorStoreManager
 from services.email_service import EmailService
 from services.web_scraper import WebScraper
 
+# Prefer the libyaml-backed C dumper when available
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Canned mock_db_manager data, built once at import. The mocks themselves are
+# still created per test: copy.copy() of a Mock shares its child mocks, so a
+# side_effect set in one test would leak into every later copy.
+_ACTIVE_URLS = (
+    {'url': 'https://example.com', 'tags': ['news'], 'check_frequency': 24},
+    {'url': 'https://test.com', 'tags': ['tech'], 'check_frequency': 12}
+)
+# Fixed timestamp for canned records, so results don't depend on the wall clock
+_NOW = datetime(2024, 1, 1)
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
@@ -25,14 +38,23 @@ def event_loop():
     yield loop
     loop.close()
 
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests"""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir, ignore_errors=True)
+@pytest.fixture(scope="session", autouse=True)
+def _silence_logging():
+    """Drop log records during the test run (use caplog.set_level to inspect them)"""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers[:] = [logging.NullHandler()]
+    root.setLevel(logging.CRITICAL)
+    yield
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _no_file_logging(monkeypatch):
+    """Keep setup_logging from opening logs/ai_assistant.log during tests"""
+    monkeypatch.delenv("AI_LOG_TO_FILE", raising=False)
+
+@pytest.fixture(scope="session")
 def test_config_data():
     """Sample configuration data for tests"""
     return {
@@ -68,47 +90,87 @@ def test_config_data():
         }
     }
 
-@pytest.fixture
-def test_config_file(temp_dir, test_config_data):
-    """Create a test configuration file"""
-    config_path = Path(temp_dir) / "test_config.yaml"
+@pytest.fixture(scope="session")
+def test_config_file(tmp_path_factory, test_config_data):
+    """Create a session-wide test configuration file and its .json sidecar (treat as read-only)"""
+    config_path = tmp_path_factory.mktemp("config") / "test_config.yaml"
+    with open(config_path, 'w') as f:
+        yaml.dump(test_config_data, f, Dumper=Dumper)
+    with open(config_path.with_suffix('.json'), 'w') as f:
+        json.dump(test_config_data, f)
+    return str(config_path)
+
+@pytest.fixture(scope="session")
+def test_config_json_file(test_config_file):
+    """JSON copy of the test configuration, for tests that don't exercise YAML parsing"""
+    return str(Path(test_config_file).with_suffix('.json'))
+
+@pytest.fixture(scope="session")
+def modified_config_file(tmp_path_factory, test_config_data):
+    """Session-wide variant of the test configuration with app.name changed to 'Modified Name'"""
+    data = copy.deepcopy(test_config_data)
+    data['app']['name'] = 'Modified Name'
+    config_path = tmp_path_factory.mktemp("config") / "modified_config.yaml"
     with open(config_path, 'w') as f:
-        yaml.dump(test_config_data, f)
+        yaml.dump(data, f, Dumper=Dumper)
+    return str(config_path)
+
+@pytest.fixture
+def writable_config_file(tmp_path, test_config_file):
+    """Per-test copy of the test configuration file for tests that modify it"""
+    config_path = tmp_path / "test_config.yaml"
+    shutil.copyfile(test_config_file, config_path)
     return str(config_path)
 
+@pytest.fixture(scope="session")
+def read_only_config_data(test_config_data):
+    """Read-only view of the test configuration, shared by every mock_config"""
+    return _read_only(test_config_data)
+
+@pytest.fixture(scope="session")
+def flat_config_data(read_only_config_data):
+    """Test configuration keyed by dot path ('app.name', 'email', ...), built once per session"""
+    return MappingProxyType(_flatten_config(read_only_config_data))
+
 @pytest.fixture
-def mock_config(test_config_data):
+def mock_config(read_only_config_data, flat_config_data):
     """Mock configuration manager"""
     config = Mock(spec=ConfigManager)
-    config.config_data = test_config_data
-    config.get.side_effect = lambda key, default=None: _get_nested_value(test_config_data, key, default)
-    config.get_section.side_effect = lambda section: test_config_data.get(section, {})
-    config.database_url = test_config_data['database']['url']
-    config.openai_api_key = test_config_data['openai']['api_key']
-    config.email_config = test_config_data['email']
-    config.vector_store_config = test_config_data['vector_store']
-    config.scraping_config = test_config_data['scraping']
+    # The session objects are read-only, so tests can share them without copying
+    data, flat_config = read_only_config_data, flat_config_data
+    config.config_data = data
+    config.get.side_effect = lambda key, default=None: flat_config.get(key, default)
+    config.get_section.side_effect = lambda section: data.get(section, {})
+    config.database_url = data['database']['url']
+    config.openai_api_key = data['openai']['api_key']
+    config.email_config = data['email']
+    config.vector_store_config = data['vector_store']
+    config.scraping_config = data['scraping']
     return config
 
-def _get_nested_value(data, key_path, default=None):
-    """Helper function to get nested dictionary values"""
-    keys = key_path.split('.')
-    value = data
-    try:
-        for key in keys:
-            value = value[key]
-        return value
-    except (KeyError, TypeError):
-        return default
+def _read_only(value):
+    """Copy nested config data into read-only mappings and tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _read_only(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_read_only(item) for item in value)
+    return value
+
+def _flatten_config(data, prefix=""):
+    """Map every dot-separated key path in a nested mapping to its value, sections included"""
+    flat = {}
+    for key, value in data.items():
+        key_path = f"{prefix}{key}"
+        flat[key_path] = value
+        if isinstance(value, Mapping):
+            flat.update(_flatten_config(value, f"{key_path}."))
+    return flat
 
 @pytest.fixture
 def mock_db_manager():
     """Mock database manager"""
     db_manager = Mock(spec=DatabaseManager)
-    db_manager.get_active_urls.return_value = [
-        {'url': 'https://example.com', 'tags': ['news'], 'check_frequency': 24},
-        {'url': 'https://test.com', 'tags': ['tech'], 'check_frequency': 12}
-    ]
+    db_manager.get_active_urls.return_value = list(_ACTIVE_URLS)
     db_manager.add_url.return_value = True
     db_manager.update_content_record.return_value = None
     db_manager.get_content_since.return_value = [
@@ -116,7 +178,7 @@ def mock_db_manager():
             'url': 'https://example.com/article1',
             'title': 'Test Article',
             'content': 'Test content',
-            'retrieved_at': datetime.now(),
+            'retrieved_at': _NOW,
             'tags': ['news']
         }
     ]
@@ -124,16 +186,36 @@ def mock_db_manager():
     return db_manager
 
 @pytest.fixture
-def temp_vector_store(temp_dir):
+def mock_pg_conn():
+    """Patch psycopg2.connect and yield the cursor every connection hands out"""
+    # Built fresh per test rather than copied from a template: copies of a
+    # MagicMock share their child mocks, so state would leak between tests
+    with patch('psycopg2.connect') as mock_connect:
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        yield mock_cursor
+
+@pytest.fixture(scope="session")
+def pg_db_manager(test_config_data):
+    """DatabaseManager whose schema setup runs once per session against a throwaway mock"""
+    # The manager only keeps its connection string, so one instance serves every
+    # test; each test's mock_pg_conn patch handles the queries it makes
+    with patch('psycopg2.connect'):
+        return DatabaseManager(test_config_data['database']['url'])
+
+@pytest.fixture
+def temp_vector_store(tmp_path):
     """Create a temporary vector store for testing"""
     from unittest.mock import Mock, patch
 
     # Create a temporary vector store directory
-    vector_store_dir = Path(temp_dir) / "test_vector_store"
+    vector_store_dir = tmp_path / "test_vector_store"
     vector_store_dir.mkdir(exist_ok=True)
 
-    # Mock the OpenAI embeddings to avoid API calls
-    with patch('data.vector_store.OpenAIEmbeddings') as mock_embeddings_class, \
+    # Mock the Google embeddings to avoid API calls
+    with patch('data.vector_store.GoogleGenerativeAIEmbeddings') as mock_embeddings_class, \
          patch('data.vector_store.chromadb.PersistentClient') as mock_client_class, \
          patch('data.vector_store.Chroma') as mock_chroma_class:
 
@@ -164,7 +246,7 @@ def temp_vector_store(temp_dir):
         vector_store = VectorStoreManager(
             persist_directory=str(vector_store_dir),
             collection_name="test_collection",
-            openai_api_key="test-key"
+            google_api_key="test-key"
         )
 
         # Override the mocked components
@@ -235,14 +317,14 @@ def temp_vector_store(temp_dir):
 #             'url': 'https://example.com/article1',
 #             'title': 'Test Article 1',
 #             'content': 'This is the content of test article 1. It contains important information about testing.',
-#             'timestamp': datetime.now(),
+#             'timestamp': _NOW,
 #             'metadata': {'author': 'Test Author', 'category': 'tech'}
 #         },
 #         {
 #             'url': 'https://example.com/article2',
 #             'title': 'Test Article 2',
 #             'content': 'This is the content of test article 2. It discusses advanced testing techniques.',
-#             'timestamp': datetime.now() - timedelta(hours=1),
+#             'timestamp': _NOW - timedelta(hours=1),
 #             'metadata': {'author': 'Another Author', 'category': 'development'}
 #         }
 #     ]
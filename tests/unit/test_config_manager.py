@@ -1,7 +1,7 @@
 # tests/unit/test_config_manager.py
 import pytest
 import os
-from pathlib import Path
+import shutil
 import yaml
 from unittest.mock import patch
 
@@ -17,17 +17,23 @@ class TestConfigManager:
         assert config.get('database.url') == test_config_data['database']['url']
         assert config.get('openai.api_key') == test_config_data['openai']['api_key']
 
-    def test_get_with_dot_notation(self, test_config_file):
+    def test_load_config_from_json_file(self, test_config_json_file, test_config_data):
+        """Test loading configuration from a JSON file"""
+        config = ConfigManager(test_config_json_file)
+
+        assert config.to_dict() == test_config_data
+
+    def test_get_with_dot_notation(self, test_config_json_file):
         """Test getting values with dot notation"""
-        config = ConfigManager(test_config_file)
+        config = ConfigManager(test_config_json_file)
 
         assert config.get('app.name') == 'Test AI Assistant'
         assert config.get('database.pool_size') == 5
         assert config.get('nonexistent.key', 'default') == 'default'
 
-    def test_get_section(self, test_config_file, test_config_data):
+    def test_get_section(self, test_config_json_file, test_config_data):
         """Test getting entire configuration sections"""
-        config = ConfigManager(test_config_file)
+        config = ConfigManager(test_config_json_file)
 
         email_section = config.get_section('email')
         assert email_section == test_config_data['email']
@@ -35,9 +41,9 @@ class TestConfigManager:
         nonexistent_section = config.get_section('nonexistent')
         assert nonexistent_section == {}
 
-    def test_set_value(self, test_config_file):
+    def test_set_value(self, test_config_json_file):
         """Test setting configuration values"""
-        config = ConfigManager(test_config_file)
+        config = ConfigManager(test_config_json_file)
 
         config.set('app.new_setting', 'new_value')
         assert config.get('app.new_setting') == 'new_value'
@@ -45,7 +51,16 @@ class TestConfigManager:
         config.set('new_section.key', 'value')
         assert config.get('new_section.key') == 'value'
 
-    def test_environment_variable_substitution(self, temp_dir):
+    def test_instances_do_not_share_parsed_config(self, test_config_json_file):
+        """Test that cached parses are copied per instance"""
+        config1 = ConfigManager(test_config_json_file)
+        config2 = ConfigManager(test_config_json_file)
+
+        config1.set('app.name', 'Changed')
+        assert config2.get('app.name') == 'Test AI Assistant'
+        assert ConfigManager(test_config_json_file).get('app.name') == 'Test AI Assistant'
+
+    def test_environment_variable_substitution(self, tmp_path):
         """Test environment variable substitution in config"""
         config_content = """
         database:
@@ -54,7 +69,7 @@ class TestConfigManager:
           key: "${TEST_API_KEY}"
         """
 
-        config_path = Path(temp_dir) / "test_env_config.yaml"
+        config_path = tmp_path / "test_env_config.yaml"
         with open(config_path, 'w') as f:
             f.write(config_content)
 
@@ -70,9 +85,9 @@ class TestConfigManager:
             assert config.get('database.url') == 'sqlite:///:memory:'
             assert config.get('api.key') == ''
 
-    def test_validate_required_settings(self, test_config_file):
+    def test_validate_required_settings(self, test_config_json_file):
         """Test validation of required settings"""
-        config = ConfigManager(test_config_file)
+        config = ConfigManager(test_config_json_file)
 
         # Should pass with test config
         assert config.validate_required_settings() == True
@@ -81,9 +96,9 @@ class TestConfigManager:
         config.set('openai.api_key', '')
         assert config.validate_required_settings() == False
 
-    def test_properties(self, test_config_file, test_config_data):
+    def test_properties(self, test_config_json_file, test_config_data):
         """Test convenience properties"""
-        config = ConfigManager(test_config_file)
+        config = ConfigManager(test_config_json_file)
 
         assert config.database_url == test_config_data['database']['url']
         assert config.openai_api_key == test_config_data['openai']['api_key']
@@ -95,28 +110,22 @@ class TestConfigManager:
         with pytest.raises(FileNotFoundError):
             ConfigManager('nonexistent_config.yaml')
 
-    def test_invalid_yaml(self, temp_dir):
+    def test_invalid_yaml(self, tmp_path):
         """Test handling of invalid YAML"""
-        config_path = Path(temp_dir) / "invalid.yaml"
+        config_path = tmp_path / "invalid.yaml"
         with open(config_path, 'w') as f:
             f.write("invalid: yaml: content: [")
 
         with pytest.raises(yaml.YAMLError):
             ConfigManager(str(config_path))
 
-    def test_reload_config(self, test_config_file):
+    def test_reload_config(self, writable_config_file, modified_config_file):
         """Test reloading configuration"""
-        config = ConfigManager(test_config_file)
+        config = ConfigManager(writable_config_file)
         original_name = config.get('app.name')
 
         # Modify the file
-        with open(test_config_file, 'r') as f:
-            data = yaml.safe_load(f)
-
-        data['app']['name'] = 'Modified Name'
-
-        with open(test_config_file, 'w') as f:
-            yaml.dump(data, f)
+        shutil.copyfile(modified_config_file, writable_config_file)
 
         # Reload and check
         config.reload()
@@ -125,8 +134,11 @@ class TestConfigManager:
 
 class TestGlobalConfig:
 
-    def test_get_config_singleton(self, test_config_file):
+    def test_get_config_singleton(self, test_config_file, monkeypatch):
         """Test global configuration singleton"""
+        # Start from an empty singleton no matter which tests ran before on this worker
+        monkeypatch.setattr('utils.config_manager._config_instance', None)
+
         config1 = get_config(test_config_file)
         config2 = get_config()
 
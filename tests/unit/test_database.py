@@ -1,9 +1,8 @@
 # tests/unit/test_database.py
 import pytest
 import psycopg2
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch
 from datetime import datetime, timedelta
-import psycopg2
 
 from data.database import DatabaseManager
 
@@ -28,33 +27,126 @@ class TestDatabaseManager:
         assert urls[0]['url'] == 'https://example.com'
         assert urls[1]['url'] == 'https://test.com'
 
-    def test_is_content_new(self, mock_config):
+    def test_is_content_new(self, pg_db_manager, mock_pg_conn):
         """Test checking if content is new - testing actual logic"""
 
-        with patch('psycopg2.connect') as mock_connect:
-            # Setup mock connection and cursor
-            mock_conn = MagicMock()
-            mock_cursor = MagicMock()
-            mock_connect.return_value.__enter__.return_value = mock_conn
-            mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-
-            # Create real DatabaseManager instance
-            db_manager = DatabaseManager(mock_config.database_url)
-
-            # Scenario 1: No existing content (cursor returns None) - should return True
-            mock_cursor.fetchone.return_value = None
-            is_new = db_manager.is_content_new('https://new-site.com', 'hash123')
-            assert is_new == True
-
-            # Scenario 2: Existing content with different hash - should return True
-            mock_cursor.fetchone.return_value = ('different_stored_hash',)
-            is_new = db_manager.is_content_new('https://example.com', 'new_hash')
-            assert is_new == True
-
-            # Scenario 3: Existing content with same hash - should return False
-            mock_cursor.fetchone.return_value = ('same_hash',)
-            is_new = db_manager.is_content_new('https://example.com', 'same_hash')
-            assert is_new == False
+        mock_cursor = mock_pg_conn
+
+        # Real DatabaseManager instance
+        db_manager = pg_db_manager
+
+        # Scenario 1: No existing content (cursor returns None) - should return True
+        mock_cursor.fetchone.return_value = None
+        is_new = db_manager.is_content_new('https://new-site.com', 'hash123')
+        assert is_new == True
+
+        # Scenario 2: Existing content with different hash - should return True
+        mock_cursor.fetchone.return_value = ('different_stored_hash',)
+        is_new = db_manager.is_content_new('https://example.com', 'new_hash')
+        assert is_new == True
+
+        # Scenario 3: Existing content with same hash - should return False
+        mock_cursor.fetchone.return_value = ('same_hash',)
+        is_new = db_manager.is_content_new('https://example.com', 'same_hash')
+        assert is_new == False
+
+    def test_init_database_creates_schema(self, mock_config, mock_pg_conn):
+        """Test a new manager creates the three tables"""
+        mock_cursor = mock_pg_conn
+
+        DatabaseManager(mock_config.database_url)
+        # Three tables plus the content_records source_url migration
+        assert mock_cursor.execute.call_count == 4
+
+    def test_get_latest_content_hashes(self, pg_db_manager, mock_pg_conn):
+        """Test fetching stored hashes for a batch of URLs in one query"""
+
+        mock_cursor = mock_pg_conn
+
+        db_manager = pg_db_manager
+
+        mock_cursor.fetchall.return_value = [('https://a.com', 'hash_a'), ('https://b.com', 'hash_b')]
+        hashes = db_manager.get_latest_content_hashes(['https://a.com', 'https://b.com', 'https://c.com'])
+
+        assert hashes == {'https://a.com': 'hash_a', 'https://b.com': 'hash_b'}
+        mock_cursor.execute.assert_called_once()
+
+        # No URLs - no query
+        mock_cursor.execute.reset_mock()
+        assert db_manager.get_latest_content_hashes([]) == {}
+        mock_cursor.execute.assert_not_called()
+
+    def test_bulk_insert_content_records(self, pg_db_manager, mock_pg_conn):
+        """Test inserting several content records with one statement"""
+
+        with patch('data.database.execute_values') as mock_execute_values:
+            db_manager = pg_db_manager
+
+            count = db_manager.bulk_insert_content_records([
+                ('https://a.com', 'hash_a', 'Title A', 'Content A', 'https://a.com'),
+                ('https://a.com/feed/1', 123, 'Entry 1', 'Content 1', 'https://a.com')
+            ])
+
+            assert count == 2
+            mock_execute_values.assert_called_once()
+            # Rows follow the column order (url, title, content_hash, content, source_url)
+            assert mock_execute_values.call_args[0][2] == [
+                ('https://a.com', 'Title A', 'hash_a', 'Content A', 'https://a.com'),
+                ('https://a.com/feed/1', 'Entry 1', '123', 'Content 1', 'https://a.com')
+            ]
+
+            # Nothing to insert - no statement
+            mock_execute_values.reset_mock()
+            assert db_manager.bulk_insert_content_records([]) == 0
+            mock_execute_values.assert_not_called()
+
+    def test_add_urls_bulk(self, pg_db_manager, mock_pg_conn):
+        """Test adding several URLs with one statement"""
+
+        with patch('data.database.execute_values') as mock_execute_values:
+            db_manager = pg_db_manager
+
+            result = db_manager.add_urls_bulk(
+                ['https://a.com', 'https://b.com', 'https://a.com'],
+                'test_user',
+                ('tech', 'news')
+            )
+
+            assert result == True
+            mock_execute_values.assert_called_once()
+            # Repeated URLs are sent once, all sharing the same tags
+            assert mock_execute_values.call_args[0][2] == [
+                ('https://a.com', 'test_user', ['tech', 'news']),
+                ('https://b.com', 'test_user', ['tech', 'news'])
+            ]
+
+            # Nothing to add - no statement
+            mock_execute_values.reset_mock()
+            assert db_manager.add_urls_bulk([]) == True
+            mock_execute_values.assert_not_called()
+
+    def test_get_latest_content_id(self, pg_db_manager, mock_pg_conn):
+        """Test reading the newest content record id"""
+        mock_cursor = mock_pg_conn
+
+        db_manager = pg_db_manager
+
+        mock_cursor.fetchone.return_value = (42,)
+        assert db_manager.get_latest_content_id() == 42
+
+    def test_get_admin_stats(self, pg_db_manager, mock_pg_conn):
+        """Test reading both admin counts with one query"""
+        mock_cursor = mock_pg_conn
+
+        db_manager = pg_db_manager
+
+        mock_cursor.fetchone.return_value = (120, 7)
+        assert db_manager.get_admin_stats() == {"content_count": 120, "queries_today": 7}
+        mock_cursor.execute.assert_called_once()
+
+        # Database errors - counts unavailable
+        mock_cursor.execute.side_effect = Exception("Database error")
+        assert db_manager.get_admin_stats() == {"content_count": None, "queries_today": None}
 
     def test_update_content_record(self, mock_db_manager):
         """Test updating content records"""
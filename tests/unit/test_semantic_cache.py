@@ -0,0 +1,50 @@
+# tests/unit/test_semantic_cache.py
+from unittest.mock import patch
+
+from utils.semantic_cache import SemanticCache
+
+class TestSemanticCache:
+
+    def test_lookup_returns_response_for_similar_question(self):
+        """Test a near-identical question embedding hits the cache"""
+        cache = SemanticCache(threshold=0.95)
+        cache.add([1.0, 0.0, 0.0], {'answer': 'cached'})
+
+        assert cache.lookup([0.99, 0.05, 0.0]) == {'answer': 'cached'}
+
+    def test_lookup_misses_for_dissimilar_or_empty_cache(self):
+        """Test unrelated questions and an empty cache return None"""
+        cache = SemanticCache(threshold=0.95)
+        assert cache.lookup([1.0, 0.0, 0.0]) is None
+
+        cache.add([1.0, 0.0, 0.0], {'answer': 'cached'})
+        assert cache.lookup([0.0, 1.0, 0.0]) is None
+
+    def test_expired_entries_are_not_returned(self):
+        """Test entries older than the TTL are treated as misses"""
+        cache = SemanticCache(ttl_seconds=300)
+
+        with patch('utils.semantic_cache.time.monotonic', return_value=1000.0):
+            cache.add([1.0, 0.0], {'answer': 'old'})
+        with patch('utils.semantic_cache.time.monotonic', return_value=1301.0):
+            assert cache.lookup([1.0, 0.0]) is None
+
+    def test_eviction_keeps_recently_used_entries(self):
+        """Test a full cache evicts the least recently used entries"""
+        cache = SemanticCache(max_entries=4)
+        vectors = [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0],
+                   [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+
+        for i, vector in enumerate(vectors):
+            with patch('utils.semantic_cache.time.monotonic', return_value=float(i)):
+                cache.add(vector, i)
+        # Touch the first entry so it is the most recently used
+        with patch('utils.semantic_cache.time.monotonic', return_value=10.0):
+            assert cache.lookup(vectors[0]) == 0
+            cache.add([1.0, 1.0, 0.0, 0.0], 'new')
+
+        assert cache.index.ntotal == 3
+        with patch('utils.semantic_cache.time.monotonic', return_value=11.0):
+            assert cache.lookup(vectors[0]) == 0
+            assert cache.lookup(vectors[3]) == 3
+            assert cache.lookup(vectors[1]) is None
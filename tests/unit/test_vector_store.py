@@ -1,9 +1,9 @@
 # tests/unit/test_vector_store.py
+import asyncio
 from unittest.mock import Mock, patch
-from pathlib import Path
 from langchain.schema import Document
 
-from data.vector_store import VectorStoreManager
+from data.vector_store import VectorStoreManager, _copy_file
 
 class TestVectorStoreManager:
 
@@ -40,6 +40,61 @@ class TestVectorStoreManager:
             assert 'total_chunks' in doc.metadata
             assert 'chunk_id' in doc.metadata
 
+    def test_add_documents_in_batches(self, temp_vector_store):
+        """Test chunks are written to the vectorstore in bounded batches"""
+        documents = [
+            {'content': f'Content for document {i}.', 'metadata': {'url': f'https://example.com/{i}'}}
+            for i in range(5)
+        ]
+        temp_vector_store.vectorstore.add_documents.side_effect = lambda docs: [
+            doc.metadata['chunk_id'] for doc in docs
+        ]
+
+        ids = temp_vector_store.add_documents(documents, batch_size=2)
+
+        # 5 single-chunk documents -> batches of 2, 2 and 1
+        batch_sizes = [len(c[0][0]) for c in temp_vector_store.vectorstore.add_documents.call_args_list]
+        assert batch_sizes == [2, 2, 1]
+        assert ids == [f'https://example.com/{i}_0' for i in range(5)]
+
+    def test_document_embeddings_are_cached_by_content(self, tmp_path):
+        """Test identical chunks are only sent to the embedding model once"""
+        with patch('data.vector_store.GoogleGenerativeAIEmbeddings') as mock_embeddings_class, \
+             patch('data.vector_store.chromadb.PersistentClient'), \
+             patch('data.vector_store.Chroma'):
+            model = mock_embeddings_class.return_value
+            model.embed_documents.side_effect = lambda texts: [[0.1, 0.2, 0.3] for _ in texts]
+
+            vector_store = VectorStoreManager(persist_directory=str(tmp_path / "vector_store"), collection_name="test_collection")
+
+            first = vector_store.embeddings.embed_documents(['chunk one', 'chunk two'])
+            second = vector_store.embeddings.embed_documents(['chunk one', 'chunk two', 'chunk three'])
+
+            assert second[:2] == first
+            # The second call only embeds the chunk that wasn't seen before
+            assert model.embed_documents.call_args_list[-1][0][0] == ['chunk three']
+            assert model.embed_documents.call_count == 2
+
+    def test_embedding_cache_is_bounded_and_reset(self, tmp_path):
+        """Test the embedding cache evicts past its size, lives outside the collection and is reset"""
+        with patch('data.vector_store.GoogleGenerativeAIEmbeddings') as mock_embeddings_class, \
+             patch('data.vector_store.chromadb.PersistentClient'), \
+             patch('data.vector_store.Chroma'):
+            model = mock_embeddings_class.return_value
+            model.embed_documents.side_effect = lambda texts: [[0.1, 0.2, 0.3] for _ in texts]
+
+            vector_store = VectorStoreManager(persist_directory=str(tmp_path / "vector_store"),
+                                              collection_name="test_collection",
+                                              embedding_cache_size=2)
+
+            vector_store.embeddings.embed_documents(['chunk one', 'chunk two', 'chunk three'])
+            cache = vector_store._embedding_cache
+            assert len(list(cache.yield_keys())) == 2
+            assert not str(cache.root_path).startswith(str(tmp_path / "vector_store") + "/")
+
+            vector_store.reset_collection()
+            assert list(cache.yield_keys()) == []
+
     def test_add_texts_with_uuid_generation(self, temp_vector_store):
         """Test adding texts with UUID generation"""
         texts = ['Test text 1', 'Test text 2']
@@ -103,6 +158,38 @@ class TestVectorStoreManager:
         assert results[0][1] == 0.9
         assert results[1][1] == 0.8
 
+    def test_similarity_search_by_vector_skips_embedding(self, temp_vector_store):
+        """Test searching with a precomputed embedding doesn't embed the query again"""
+        mock_docs = [Mock(page_content="Test content 1")]
+        temp_vector_store.vectorstore.similarity_search_by_vector.return_value = mock_docs
+
+        results = temp_vector_store.similarity_search_by_vector([0.1, 0.2, 0.3], k=1)
+
+        assert results == mock_docs
+        temp_vector_store.vectorstore.similarity_search_by_vector.assert_called_once_with(
+            embedding=[0.1, 0.2, 0.3], k=1
+        )
+        temp_vector_store.embeddings.embed_query.assert_not_called()
+
+    def test_similarity_search_multi_merges_filters(self, temp_vector_store):
+        """Test multi-filter search queries each filter and keeps the k closest results"""
+        branch_results = {
+            'https://example.com/1': [(Mock(page_content="A"), 0.3), (Mock(page_content="B"), 0.9)],
+            'https://example.com/2': [(Mock(page_content="C"), 0.1), (Mock(page_content="D"), 0.5)]
+        }
+        temp_vector_store.vectorstore.similarity_search_with_score.side_effect = \
+            lambda query, k, filter: branch_results[filter['url']]
+
+        filters = [{'url': url} for url in branch_results]
+        results = asyncio.run(temp_vector_store.similarity_search_multi("test query", filters, k=3))
+
+        assert [doc.page_content for doc, _ in results] == ["C", "A", "D"]
+        assert temp_vector_store.vectorstore.similarity_search_with_score.call_count == 2
+        for filter_dict in filters:
+            temp_vector_store.vectorstore.similarity_search_with_score.assert_any_call(
+                query="test query", k=3, filter=filter_dict
+            )
+
     def test_delete_documents_success(self, temp_vector_store):
         """Test successful document deletion"""
         result = temp_vector_store.delete_documents(['doc1', 'doc2'])
@@ -111,30 +198,25 @@ class TestVectorStoreManager:
         temp_vector_store.vectorstore.delete.assert_called_once_with(ids=['doc1', 'doc2'])
 
     def test_delete_by_metadata_logic(self, temp_vector_store):
-        """Test delete by metadata logic using the mocked client"""
+        """Test delete by metadata issues a single filtered delete"""
         # The client is already mocked in the fixture, so we can test the logic
         mock_collection = temp_vector_store.client.get_collection.return_value
-        mock_collection.get.return_value = {'ids': ['doc1', 'doc2']}
 
         result = temp_vector_store.delete_by_metadata({'url': 'https://example.com'})
 
         assert result == True
-        # Verify the collection was queried with the filter
-        mock_collection.get.assert_called_once_with(where={'url': 'https://example.com'})
-        # Verify the documents were deleted
-        mock_collection.delete.assert_called_once_with(ids=['doc1', 'doc2'])
+        # The filter goes straight to delete, without fetching matching ids first
+        mock_collection.delete.assert_called_once_with(where={'url': 'https://example.com'})
+        mock_collection.get.assert_not_called()
 
-    def test_delete_by_metadata_no_matches(self, temp_vector_store):
-        """Test delete by metadata when no documents match"""
+    def test_delete_by_metadata_error(self, temp_vector_store):
+        """Test delete by metadata reports failure when the delete raises"""
         mock_collection = temp_vector_store.client.get_collection.return_value
-        mock_collection.get.return_value = {'ids': []}
+        mock_collection.delete.side_effect = Exception("Delete error")
 
         result = temp_vector_store.delete_by_metadata({'url': 'https://nonexistent.com'})
 
-        assert result == True
-        mock_collection.get.assert_called_once_with(where={'url': 'https://nonexistent.com'})
-        # Delete should not be called when no IDs found
-        mock_collection.delete.assert_not_called()
+        assert result == False
 
     def test_get_collection_stats_utilizes_mocked_client(self, temp_vector_store):
         """Test collection stats using the pre-configured mocked client"""
@@ -156,6 +238,20 @@ class TestVectorStoreManager:
         assert 'https://example.com/1' in stats['sample_urls']
         assert len(stats['sample_urls']) <= 5  # Should limit to 5 URLs
 
+    def test_warmup_queries_with_stored_embedding(self, temp_vector_store):
+        """Test warmup runs one query with a stored embedding and skips empty collections"""
+        mock_collection = temp_vector_store.client.get_collection.return_value
+        mock_collection.get.return_value = {'embeddings': [[0.1, 0.2, 0.3]]}
+
+        assert temp_vector_store.warmup() == True
+        mock_collection.query.assert_called_once_with(query_embeddings=[[0.1, 0.2, 0.3]], n_results=1)
+
+        # Empty collection - nothing to load
+        mock_collection.query.reset_mock()
+        mock_collection.get.return_value = {'embeddings': []}
+        assert temp_vector_store.warmup() == False
+        mock_collection.query.assert_not_called()
+
     def test_as_retriever_with_default_and_custom_kwargs(self, temp_vector_store):
         """Test as_retriever with default and custom search kwargs"""
         # Test with default kwargs
@@ -241,9 +337,9 @@ class TestVectorStoreManager:
             # Verify the vectorstore was replaced
             assert temp_vector_store.vectorstore == mock_new_vectorstore
 
-    def test_backup_collection_copies_directory(self, temp_vector_store, temp_dir):
+    def test_backup_collection_copies_directory(self, temp_vector_store, tmp_path):
         """Test collection backup copies the persist directory"""
-        backup_path = Path(temp_dir) / "backup"
+        backup_path = tmp_path / "backup"
 
         with patch('shutil.copytree') as mock_copy:
             result = temp_vector_store.backup_collection(str(backup_path))
@@ -252,5 +348,131 @@ class TestVectorStoreManager:
             mock_copy.assert_called_once_with(
                 temp_vector_store.persist_directory,
                 str(backup_path),
-                dirs_exist_ok=True
+                dirs_exist_ok=True,
+                copy_function=_copy_file
+            )
+
+    def test_copy_file_falls_back_when_clone_unsupported(self, tmp_path):
+        """Test files are still copied when the filesystem can't clone them"""
+        src = tmp_path / "src.bin"
+        dst = tmp_path / "dst.bin"
+        src.write_bytes(b"vector data")
+
+        with patch('data.vector_store.fcntl.ioctl', side_effect=OSError("not supported")):
+            _copy_file(str(src), str(dst))
+
+        assert dst.read_bytes() == b"vector data"
+
+    def test_faiss_backend_persists_and_searches(self, tmp_path):
+        """Test the FAISS backend adds, saves, reloads and searches texts"""
+        vectors = {
+            'dimension probe': [0.0, 0.0, 0.0, 1.0],
+            'alpha': [1.0, 0.0, 0.0, 0.0],
+            'beta': [0.0, 1.0, 0.0, 0.0],
+            'gamma': [0.0, 0.0, 1.0, 0.0]
+        }
+
+        with patch('data.vector_store.GoogleGenerativeAIEmbeddings') as mock_embeddings_class:
+            mock_embeddings = Mock()
+            mock_embeddings.embed_documents.side_effect = lambda texts: [vectors[text] for text in texts]
+            mock_embeddings.embed_query.side_effect = lambda text: vectors[text]
+            mock_embeddings_class.return_value = mock_embeddings
+
+            vector_store = VectorStoreManager(
+                persist_directory=str(tmp_path / "vector_store"),
+                collection_name="test_collection",
+                google_api_key="test-key",
+                backend="faiss"
+            )
+            ids = vector_store.add_texts(
+                ['alpha', 'beta', 'gamma'],
+                [{'url': 'https://a.com'}, {'url': 'https://b.com'}, {'url': 'https://c.com'}]
+            )
+            assert len(ids) == 3
+            assert vector_store.persist() == True
+
+            # A new manager loads the saved index instead of starting empty
+            reloaded = VectorStoreManager(
+                persist_directory=str(tmp_path / "vector_store"),
+                collection_name="test_collection",
+                google_api_key="test-key",
+                backend="faiss"
+            )
+
+            results = reloaded.similarity_search('beta', k=1)
+            assert [doc.page_content for doc in results] == ['beta']
+            assert reloaded.get_collection_stats()['total_documents'] == 3
+
+            # HNSW indexes cannot remove vectors
+            assert reloaded.delete_by_metadata({'url': 'https://a.com'}) == False
+            assert reloaded.delete_documents(ids[:1]) == False
+            assert reloaded.get_collection_stats()['total_documents'] == 3
+
+    def test_faiss_backend_compresses_large_index(self, tmp_path):
+        """Test the FAISS index is rebuilt as IVF-PQ past the threshold and still searchable"""
+        import faiss
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        texts = [f"text {i}" for i in range(300)]
+        vectors = {text: rng.random(8).tolist() for text in texts + ['dimension probe']}
+
+        with patch('data.vector_store.GoogleGenerativeAIEmbeddings') as mock_embeddings_class:
+            mock_embeddings = Mock()
+            mock_embeddings.embed_documents.side_effect = lambda batch: [vectors[text] for text in batch]
+            mock_embeddings.embed_query.side_effect = lambda text: vectors[text]
+            mock_embeddings_class.return_value = mock_embeddings
+
+            vector_store = VectorStoreManager(
+                persist_directory=str(tmp_path / "vector_store"),
+                collection_name="test_collection",
+                google_api_key="test-key",
+                backend="faiss",
+                pq_threshold=256
+            )
+            vector_store.add_texts(texts[:200])
+            vector_store.persist()
+            assert isinstance(vector_store.vectorstore.index, faiss.IndexHNSWFlat)
+
+            vector_store.add_texts(texts[200:])
+            vector_store.persist()
+            index = vector_store.vectorstore.index
+            assert isinstance(index, faiss.IndexIVFPQ)
+            assert index.ntotal == 300
+
+            # Positions are kept, so results still map back to their texts
+            results = vector_store.similarity_search('text 42', k=5)
+            assert 'text 42' in [doc.page_content for doc in results]
+
+    def test_faiss_backend_merges_saves_from_other_processes(self, tmp_path):
+        """Test persist() replays its additions onto an index another manager saved meanwhile"""
+        vectors = {
+            'dimension probe': [0.0, 0.0, 0.0, 1.0],
+            'alpha': [1.0, 0.0, 0.0, 0.0],
+            'beta': [0.0, 1.0, 0.0, 0.0]
+        }
+
+        with patch('data.vector_store.GoogleGenerativeAIEmbeddings') as mock_embeddings_class:
+            mock_embeddings = Mock()
+            mock_embeddings.embed_documents.side_effect = lambda texts: [vectors[text] for text in texts]
+            mock_embeddings.embed_query.side_effect = lambda text: vectors[text]
+            mock_embeddings_class.return_value = mock_embeddings
+
+            # Two managers over one directory, like the app and scheduler services
+            first, second = (VectorStoreManager(persist_directory=str(tmp_path / "vector_store"),
+                                                collection_name="test_collection",
+                                                google_api_key="test-key",
+                                                backend="faiss")
+                             for _ in range(2))
+            first.add_texts(['alpha'])
+            second.add_texts(['beta'])
+            assert first.persist() == True
+            assert second.persist() == True
+
+            reloaded = VectorStoreManager(
+                persist_directory=str(tmp_path / "vector_store"),
+                collection_name="test_collection",
+                google_api_key="test-key",
+                backend="faiss"
             )
+            assert reloaded.get_collection_stats()['total_documents'] == 2
@@ -1,24 +1,76 @@
 # web/streamlit_app.py
 import streamlit as st
 import asyncio
+import functools
+import hashlib
+import json
+import time
 from datetime import datetime, timedelta
 import sys
 import os
-import psycopg2
+import threading
+from collections import OrderedDict
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
-from src.agents.query_engine import QueryEngine
-from src.agents.summarizer import Summarizer
-from src.data.database import DatabaseManager
-from src.data.vector_store import VectorStoreManager
-from src.agents.content_retriever import ContentRetriever
-from src.services.email_service import EmailService
 from src.utils.config_manager import get_config
 
+# Number of earlier question/answer pairs sent to the query engine as chat history
+MAX_HISTORY_TURNS = 10
+
+# Number of chat messages rendered before older ones are hidden behind a toggle
+MAX_VISIBLE_MESSAGES = 20
+
+# Lifetime and size of the cache of answers to repeated exchanges
+ANSWER_CACHE_TTL = 3600
+ANSWER_CACHE_MAX_ENTRIES = 256
+
+@st.cache_resource
+def get_background_loop():
+    """Event loop running on a daemon thread, shared by all sessions for async backend calls"""
+    # uvloop only for this worker loop; Streamlit's own server loop is left alone
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="async-backend", daemon=True).start()
+    return loop
+
+def run_sync(coro):
+    """Run a coroutine on the background loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop()).result()
+
+def iter_in_background(agen):
+    """Iterate an async generator on the background loop from the script thread"""
+    loop = get_background_loop()
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        # A rerun or stop can abandon the iteration early; close the generator on its
+        # loop so the model's response stream is released now rather than at GC
+        asyncio.run_coroutine_threadsafe(agen.aclose(), loop)
+
+def run_in_background(func, *args, **kwargs):
+    """Start a blocking call on the background loop's thread pool without waiting for it"""
+    loop = get_background_loop()
+    loop.call_soon_threadsafe(loop.run_in_executor, None, functools.partial(func, *args, **kwargs))
+
 # Initialize components
 @st.cache_resource
 def init_components():
     """Initialize and cache all backend components"""
+    # Backend modules pull in chromadb, LangChain and psycopg2; importing them
+    # here lets the page header render before that cost is paid
+    from src.agents.content_retriever import ContentRetriever
+    from src.agents.query_engine import QueryEngine
+    from src.data.database import DatabaseManager
+    from src.data.vector_store import VectorStoreManager
+
     config = get_config()
 
     # Initialize database manager
@@ -27,9 +79,13 @@ def init_components():
     # Initialize vector store
     vector_store = VectorStoreManager(
         persist_directory=config.vector_store_config['path'],
-        collection_name=config.vector_store_config['collection_name']
+        collection_name=config.vector_store_config['collection_name'],
+        backend=config.vector_store_config.get('backend', 'chroma')
     )
 
+    # Load the index now so the first chat query doesn't pay for it
+    vector_store.warmup()
+
     # Initialize content retriever
     content_retriever = ContentRetriever(
         vector_store=vector_store,
@@ -42,339 +98,466 @@ def init_components():
         model_config=config.google_model_config
     )
 
-    # Initialize summarizer
-    summarizer = Summarizer(
-        db_manager=db_manager,
-        model_config=config.google_model_config
-    )
-
-    # Initialize email service
-    email_service = EmailService(config.email_config)
-
     return {
         "db_manager": db_manager,
         "vector_store": vector_store,
         "content_retriever": content_retriever,
         "query_engine": query_engine,
-        "summarizer": summarizer,
-        "email_service": email_service,
-        "config": config
+        "config": config,
+        "loop": get_background_loop()
     }
 
-# Create an async wrapper for Streamlit
-async def run_async(func, *args, **kwargs):
-    """Helper function to run async functions in Streamlit"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    result = await func(*args, **kwargs)
-    loop.close()
-    return result
+@st.cache_resource
+def get_summarizer():
+    """Summarizer, created the first time a summary is requested"""
+    from src.agents.summarizer import Summarizer
 
-def main():
-    st.set_page_config(
-        page_title="AI Assistant Agent",
-        page_icon="🤖",
-        layout="wide"
+    components = init_components()
+    return Summarizer(
+        db_manager=components["db_manager"],
+        model_config=components["config"].google_model_config
     )
 
-    st.title("🤖 AI Assistant Agent")
+@st.cache_resource
+def get_email_service():
+    """Email service, created the first time an email is sent"""
+    from src.services.email_service import EmailService
 
-    # Initialize all components
-    components = init_components()
+    return EmailService(init_components()["config"].email_config)
+
+@st.cache_resource
+def get_semantic_cache():
+    """Shared cache of answers to standalone questions, matched by embedding similarity"""
+    from src.utils.semantic_cache import SemanticCache
+
+    return SemanticCache(threshold=0.95, ttl_seconds=300, max_entries=1000)
+
+async def _dashboard_fetch(db_manager):
+    """Fetch the monitored URLs and admin stats concurrently"""
+    return await asyncio.gather(
+        asyncio.to_thread(db_manager.get_active_urls),
+        asyncio.to_thread(db_manager.get_admin_stats)
+    )
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_dashboard_data(_db_manager):
+    """Monitored URLs and admin stats, refreshed at most every 30s"""
+    urls, admin_stats = run_sync(_dashboard_fetch(_db_manager))
+    return [dict(url_info) for url_info in urls], admin_stats
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_vector_stats(_vector_store):
+    """Vector store collection stats, refreshed at most every 30s"""
+    return _vector_store.get_collection_stats()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_daily_summary(_summarizer, content_version: int):
+    """Daily summary, regenerated only when new content arrives or after an hour"""
+    return run_sync(_summarizer.acreate_daily_summary())
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_topic_summary(_summarizer, topic: str, days: int, content_version: int):
+    """Topic summary, regenerated only for new inputs, new content or after an hour"""
+    return run_sync(_summarizer.acreate_topic_summary(topic, days))
+
+def _history_key(chat_history: list) -> str:
+    """Digest of the role/content of each history message, used as an answer cache key"""
+    messages = [(message["role"], message["content"]) for message in chat_history]
+    return hashlib.blake2b(json.dumps(messages).encode(), digest_size=16).hexdigest()
+
+@st.cache_resource
+def get_answer_cache():
+    """Recent answers keyed on (prompt, history digest, web search flag), shared by all sessions
+
+    Returned with the lock guarding it, since sessions run on separate script threads
+    """
+    return OrderedDict(), threading.Lock()
+
+def _lookup_answer(key):
+    """Cached answer for an exchange, or None when missing or older than the TTL"""
+    cache, lock = get_answer_cache()
+    with lock:
+        entry = cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < ANSWER_CACHE_TTL:
+        return entry[1]
+    return None
+
+def _store_answer(key, response):
+    """Cache the answer for an exchange, dropping the oldest answers beyond the limit"""
+    cache, lock = get_answer_cache()
+    with lock:
+        cache.pop(key, None)
+        cache[key] = (time.monotonic(), response)
+        while len(cache) > ANSWER_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+def _regenerate_last_answer():
+    """Drop the last exchange and queue its question to be answered again"""
+    st.session_state.messages.pop()
+    st.session_state.regenerate_prompt = st.session_state.messages.pop()["content"]
+
+def _sources_md(sources: list) -> str:
+    """Render a list of sources as one markdown bullet list"""
+    return "\n".join(
+        f"- [{source.get('title', 'Unknown')}]({source.get('url', '#')})" for source in sources
+    )
+
+@st.fragment
+def _sidebar_urls(db_manager):
+    """Monitored URL management; adding URLs reruns only this part of the page"""
+    st.header("Configuration")
+
+    # URL Management
+    st.subheader("Monitored URLs")
+    new_urls = st.text_area("Add URL(s) to monitor (one per line):")
+    tags = st.text_input("Tags (comma-separated):")
+
+    if st.button("Add URL"):
+        url_list = [url.strip() for url in new_urls.splitlines() if url.strip()]
+        if url_list:
+            tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()]
+            success = db_manager.add_urls_bulk(url_list, "streamlit_user", tag_list)
+            if success:
+                get_dashboard_data.clear()
+                st.success(f"Added {len(url_list)} URL(s) successfully!")
+            else:
+                st.error("Failed to add URL")
+
+    # Display current URLs
+    urls, _ = get_dashboard_data(db_manager)
+    if urls:
+        st.write("**Current URLs:**")
+        for url_info in urls:
+            st.write(f"• {url_info['url']}")
+            if url_info.get('tags'):
+                st.write(f"  Tags: {', '.join(url_info['tags'])}")
+
+@st.fragment
+def _chat_tab(components):
+    """Chat tab; chat input and Regenerate rerun only this tab"""
     db_manager = components["db_manager"]
     vector_store = components["vector_store"]
-    content_retriever = components["content_retriever"]
     query_engine = components["query_engine"]
-    summarizer = components["summarizer"]
-    email_service = components["email_service"]
-    config = components["config"]
 
-    # Sidebar for configuration
-    with st.sidebar:
-        st.header("Configuration")
-
-        # URL Management
-        st.subheader("Monitored URLs")
-        new_url = st.text_input("Add new URL to monitor:")
-        tags = st.text_input("Tags (comma-separated):")
-
-        if st.button("Add URL"):
-            if new_url:
-                tag_list = [tag.strip() for tag in tags.split(",")] if tags else []
-                success = db_manager.add_url(new_url, "streamlit_user", tag_list)
-                if success:
-                    st.success("URL added successfully!")
-                else:
-                    st.error("Failed to add URL")
+    st.header("Ask Questions")
+
+    # Chat interface
+    if "messages" not in st.session_state:
+        st.session_state.messages = []
+
+    # Display chat history, only the most recent messages unless asked for all
+    messages = st.session_state.messages
+    if len(messages) > MAX_VISIBLE_MESSAGES:
+        if not st.toggle("Show full history", key="show_all"):
+            messages = messages[-MAX_VISIBLE_MESSAGES:]
+
+    for message in messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+            if "sources" in message:
+                with st.expander("Sources"):
+                    st.markdown(_sources_md(message["sources"]))
+
+    if st.session_state.messages and st.session_state.messages[-1]["role"] == "assistant":
+        st.button("🔄 Regenerate", on_click=_regenerate_last_answer)
+
+    # Chat input, or the question queued by Regenerate
+    prompt = st.chat_input("Ask me anything...")
+    regenerate = "regenerate_prompt" in st.session_state
+    if regenerate:
+        prompt = st.session_state.pop("regenerate_prompt")
+
+    if prompt:
+        # Add user message
+        st.session_state.messages.append({"role": "user", "content": prompt})
+
+        with st.chat_message("user"):
+            st.markdown(prompt)
+
+        # Generate response
+        with st.chat_message("assistant"):
+            # Use the query engine to get a real response
+            use_web_search = True
+
+            # Send only the most recent turns as chat history, excluding the
+            # current user message; older turns would not fit the prompt anyway
+            chat_history = st.session_state.messages[-2 * MAX_HISTORY_TURNS - 1:-1]
+            answer_key = (prompt, _history_key(chat_history), use_web_search)
+
+            start_time = time.perf_counter()
+
+            # Reuse the answer when the same exchange was asked recently, and for
+            # standalone questions (no earlier turns to depend on) the answer to a
+            # near-identical recent question. Regenerate skips both caches
+            semantic_cache = get_semantic_cache()
+            prompt_embedding = None
+            response = None
+            if not regenerate:
+                with st.spinner("Thinking..."):
+                    response = _lookup_answer(answer_key)
+                    if response is None and not chat_history:
+                        prompt_embedding = vector_store.embeddings.embed_query(prompt)
+                        response = semantic_cache.lookup(prompt_embedding)
+
+            if response is None:
+                # Stream the answer from the background loop as it is generated;
+                # sources and confidence arrive in the final item
+                final = {}
+
+                def answer_chunks():
+                    for item in iter_in_background(query_engine.astream_answer(
+                        question=prompt,
+                        use_web_search=use_web_search,
+                        chat_history=chat_history,
+                        # Already embedded for the semantic cache lookup on a miss
+                        query_embedding=prompt_embedding
+                    )):
+                        if isinstance(item, dict):
+                            final.update(item)
+                        else:
+                            yield item
+
+                st.write_stream(answer_chunks())
+                response = final
+
+                _store_answer(answer_key, response)
+                if prompt_embedding is not None:
+                    semantic_cache.add(prompt_embedding, response)
+            else:
+                st.markdown(response["answer"])
+
+            response_time = time.perf_counter() - start_time
+
+            # Show confidence and sources
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                st.metric("Confidence", response["confidence"])
+
+            with st.expander("Sources"):
+                st.markdown(_sources_md(response["sources"]))
+
+            # Add assistant response to chat history
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": response["answer"],
+                "sources": response["sources"]
+            })
+
+            # Log the query for analytics without holding up the response
+            run_in_background(
+                db_manager.log_query,
+                question=prompt,
+                answer=response["answer"],
+                sources=response["sources"],
+                confidence=response["confidence"],
+                response_time=response_time
+            )
+
+@st.fragment
+def _summaries_tab(db_manager):
+    """Summaries tab; generating or emailing a summary reruns only this tab"""
+    st.header("Content Summaries")
+
+    col1, col2 = st.columns(2)
+
+    # Initialize session state for summaries and email actions
+    if "daily_summary" not in st.session_state:
+        st.session_state.daily_summary = None
+    if "topic_summary" not in st.session_state:
+        st.session_state.topic_summary = None
+    if "email_daily" not in st.session_state:
+        st.session_state.email_daily = False
+    if "email_topic" not in st.session_state:
+        st.session_state.email_topic = False
+
+    # Helper functions for email actions
+    def email_daily_summary():
+        st.session_state.email_daily = True
+
+    def email_topic_summary():
+        st.session_state.email_topic = True
+
+    with col1:
+        st.subheader("Daily Summary")
+        if st.button("Generate Daily Summary"):
+            with st.spinner("Generating summary..."):
+                # Call the actual summarizer (cached until new content is stored)
+                summary_data = get_daily_summary(get_summarizer(), db_manager.get_latest_content_id())
+                st.session_state.daily_summary = summary_data
+
+                st.write(summary_data.get("summary", "No summary available"))
+                st.metric("New Items", summary_data.get("content_count", 0))
+
+                # Display sources if available
+                if summary_data.get("sources"):
+                    with st.expander("Sources"):
+                        st.markdown(_sources_md(summary_data["sources"]))
 
-        # Display current URLs
-        urls = db_manager.get_active_urls()
-        if urls:
-            st.write("**Current URLs:**")
-            for url_info in urls:
-                st.write(f"• {url_info['url']}")
-                if url_info.get('tags'):
-                    st.write(f"  Tags: {', '.join(url_info['tags'])}")
+        # Email button (using a callback to avoid direct session state access)
+        if st.session_state.daily_summary is not None:
+            st.button("Email This Summary", on_click=email_daily_summary)
 
-    # Main content area
-    tab1, tab2, tab3 = st.tabs(["💬 Chat", "📊 Summaries", "⚙️ Admin"])
+        # Handle email sending based on state flag
+        if st.session_state.email_daily and st.session_state.daily_summary is not None:
+            with st.spinner("Sending email..."):
+                if run_sync(get_email_service().send_daily_summary(st.session_state.daily_summary)):
+                    st.success("Summary email sent successfully!")
+                else:
+                    st.error("Failed to send summary email")
+            # Reset the flag
+            st.session_state.email_daily = False
 
-    with tab1:
-        st.header("Ask Questions")
+    with col2:
+        st.subheader("Topic Summary")
+        topic = st.text_input("Enter topic:")
+        days = st.slider("Days to look back:", 1, 30, 7)
+
+        if st.button("Generate Topic Summary") and topic:
+            with st.spinner(f"Generating summary for '{topic}'..."):
+                # Call the actual topic summarizer (cached until new content is stored)
+                topic_summary = get_topic_summary(get_summarizer(), topic, days, db_manager.get_latest_content_id())
+                st.session_state.topic_summary = topic_summary
 
-        # Chat interface
-        if "messages" not in st.session_state:
-            st.session_state.messages = []
+                st.write(topic_summary.get("summary", "No summary available"))
+                st.metric("Relevant Items", topic_summary.get("content_count", 0))
 
-        # Display chat history
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
-                if "sources" in message:
+                # Display sources if available
+                if topic_summary.get("sources"):
                     with st.expander("Sources"):
-                        for source in message["sources"]:
-                            st.write(f"• [{source['title']}]({source['url']})")
+                        st.markdown(_sources_md(topic_summary["sources"]))
 
-        # Chat input
-        if prompt := st.chat_input("Ask me anything..."):
-            # Add user message
-            st.session_state.messages.append({"role": "user", "content": prompt})
+        # Email button (using a callback to avoid direct session state access)
+        if st.session_state.topic_summary is not None:
+            st.button("Email This Topic Summary", on_click=email_topic_summary)
 
-            with st.chat_message("user"):
-                st.markdown(prompt)
+        # Handle email sending based on state flag
+        if st.session_state.email_topic and st.session_state.topic_summary is not None:
+            with st.spinner("Sending email..."):
+                if run_sync(get_email_service().send_topic_summary(st.session_state.topic_summary)):
+                    st.success("Topic summary email sent successfully!")
+                else:
+                    st.error("Failed to send topic summary email")
+            # Reset the flag
+            st.session_state.email_topic = False
 
-            # Generate response
-            with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    # Use the query engine to get a real response
-                    use_web_search = True
+@st.fragment(run_every=30)
+def _admin_metrics(db_manager, vector_store):
+    """System and vector store stats, refreshed every 30 seconds on their own"""
+    urls, admin_stats = get_dashboard_data(db_manager)
 
-                    # Format chat history for the query engine
-                    chat_history = st.session_state.messages[:-1]  # Exclude the current user message
+    # System stats
+    col1, col2, col3 = st.columns(3)
 
-                    # Run the async query in a synchronous context
-                    response = asyncio.run(query_engine.answer_query(
-                        question=prompt,
-                        use_web_search=use_web_search,
-                        chat_history=chat_history
-                    ))
+    with col1:
+        st.metric("Monitored URLs", len(urls) if urls else 0)
 
-                    st.markdown(response["answer"])
+    with col2:
+        st.metric("Total Content Items", admin_stats["content_count"])
 
-                    # Show confidence and sources
-                    col1, col2 = st.columns([1, 3])
-                    with col1:
-                        st.metric("Confidence", response["confidence"])
+    with col3:
+        st.metric("Queries Today", admin_stats["queries_today"])
 
-                    with st.expander("Sources"):
-                        for source in response["sources"]:
-                            st.write(f"• [{source.get('title', 'Unknown')}]({source.get('url', '#')})")
-
-                    # Add assistant response to chat history
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": response["answer"],
-                        "sources": response["sources"]
-                    })
-
-                    # Log the query for analytics
-                    start_time = datetime.now()
-                    end_time = datetime.now()
-                    response_time = (end_time - start_time).total_seconds()
-                    db_manager.log_query(
-                        question=prompt,
-                        answer=response["answer"],
-                        sources=response["sources"],
-                        confidence=response["confidence"],
-                        response_time=response_time
-                    )
+    # Vector store stats
+    st.subheader("Vector Store Stats")
+    vector_stats = get_vector_stats(vector_store)
+    st.json(vector_stats)
 
-    with tab2:
-        st.header("Content Summaries")
+@st.fragment
+def _admin_tab(components):
+    """Admin tab; manual operations rerun only this tab"""
+    db_manager = components["db_manager"]
+    vector_store = components["vector_store"]
+    content_retriever = components["content_retriever"]
 
-        col1, col2 = st.columns(2)
+    st.header("System Administration")
+
+    _admin_metrics(db_manager, vector_store)
+
+    # Manual operations
+    st.subheader("Manual Operations")
+
+    if st.button("Trigger Content Update"):
+        with st.spinner("Retrieving content from monitored URLs..."):
+            # Get active URLs
+            urls_to_update = [item['url'] for item in db_manager.get_active_urls()]
+
+            if urls_to_update:
+                # Run content retrieval
+                result = run_sync(content_retriever.retrieve_content(urls_to_update))
+                get_vector_stats.clear()
+                new_content_count = sum(1 for item in result if item.get('is_new', False))
+                st.success(f"Content update completed! Retrieved {len(result)} URLs, {new_content_count} with new content.")
+            else:
+                st.warning("No URLs configured for monitoring")
+
+    if st.button("Send Test Summary Email"):
+        with st.spinner("Sending test email..."):
+            # Create a test summary
+            test_summary = {
+                "summary": "This is a test summary email from the AI Assistant Agent.",
+                "content_count": 3,
+                "sources": [
+                    {"title": "Test Source 1", "url": "https://example.com/1"},
+                    {"title": "Test Source 2", "url": "https://example.com/2"}
+                ],
+                "generated_at": datetime.now().isoformat()
+            }
+
+            # Send the email
+            if run_sync(get_email_service().send_daily_summary(test_summary)):
+                st.success("Test email sent successfully!")
+            else:
+                st.error("Failed to send test email")
+
+    # Database maintenance
+    st.subheader("Database Maintenance")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if st.button("Reset Vector Store"):
+            if vector_store.reset_collection():
+                get_vector_stats.clear()
+                st.success("Vector store reset successfully!")
+            else:
+                st.error("Failed to reset vector store")
+
+    with col2:
+        backup_path = st.text_input("Backup Path:", value="./data/vector_store_backup")
+        if st.button("Backup Vector Store"):
+            if vector_store.backup_collection(backup_path):
+                st.success(f"Vector store backed up to {backup_path}")
+            else:
+                st.error("Failed to backup vector store")
 
-        # Initialize session state for summaries and email actions
-        if "daily_summary" not in st.session_state:
-            st.session_state.daily_summary = None
-        if "topic_summary" not in st.session_state:
-            st.session_state.topic_summary = None
-        if "email_daily" not in st.session_state:
-            st.session_state.email_daily = False
-        if "email_topic" not in st.session_state:
-            st.session_state.email_topic = False
+def main():
+    st.set_page_config(
+        page_title="AI Assistant Agent",
+        page_icon="🤖",
+        layout="wide"
+    )
 
-        # Helper functions for email actions
-        def email_daily_summary():
-            st.session_state.email_daily = True
-
-        def email_topic_summary():
-            st.session_state.email_topic = True
-
-        with col1:
-            st.subheader("Daily Summary")
-            if st.button("Generate Daily Summary"):
-                with st.spinner("Generating summary..."):
-                    # Call the actual summarizer
-                    summary_data = summarizer.create_daily_summary()
-                    st.session_state.daily_summary = summary_data
-
-                    st.write(summary_data.get("summary", "No summary available"))
-                    st.metric("New Items", summary_data.get("content_count", 0))
-
-                    # Display sources if available
-                    if summary_data.get("sources"):
-                        with st.expander("Sources"):
-                            for source in summary_data.get("sources", []):
-                                st.write(f"• [{source.get('title', 'Unknown')}]({source.get('url', '#')})")
-
-            # Email button (using a callback to avoid direct session state access)
-            if st.session_state.daily_summary is not None:
-                st.button("Email This Summary", on_click=email_daily_summary)
-
-            # Handle email sending based on state flag
-            if st.session_state.email_daily and st.session_state.daily_summary is not None:
-                with st.spinner("Sending email..."):
-                    if asyncio.run(email_service.send_daily_summary(st.session_state.daily_summary)):
-                        st.success("Summary email sent successfully!")
-                    else:
-                        st.error("Failed to send summary email")
-                # Reset the flag
-                st.session_state.email_daily = False
-
-        with col2:
-            st.subheader("Topic Summary")
-            topic = st.text_input("Enter topic:")
-            days = st.slider("Days to look back:", 1, 30, 7)
-
-            if st.button("Generate Topic Summary") and topic:
-                with st.spinner(f"Generating summary for '{topic}'..."):
-                    # Call the actual topic summarizer
-                    topic_summary = summarizer.create_topic_summary(topic, days)
-                    st.session_state.topic_summary = topic_summary
-
-                    st.write(topic_summary.get("summary", "No summary available"))
-                    st.metric("Relevant Items", topic_summary.get("content_count", 0))
-
-                    # Display sources if available
-                    if topic_summary.get("sources"):
-                        with st.expander("Sources"):
-                            for source in topic_summary.get("sources", []):
-                                st.write(f"• [{source.get('title', 'Unknown')}]({source.get('url', '#')})")
-
-            # Email button (using a callback to avoid direct session state access)
-            if st.session_state.topic_summary is not None:
-                st.button("Email This Topic Summary", on_click=email_topic_summary)
-
-            # Handle email sending based on state flag
-            if st.session_state.email_topic and st.session_state.topic_summary is not None:
-                with st.spinner("Sending email..."):
-                    if asyncio.run(email_service.send_topic_summary(st.session_state.topic_summary)):
-                        st.success("Topic summary email sent successfully!")
-                    else:
-                        st.error("Failed to send topic summary email")
-                # Reset the flag
-                st.session_state.email_topic = False
+    st.title("🤖 AI Assistant Agent")
 
-    with tab3:
-        st.header("System Administration")
-
-        # System stats
-        col1, col2, col3 = st.columns(3)
-
-        # Query for actual stats
-        content_count_query = """
-            SELECT COUNT(*) FROM content_records
-        """
-        queries_today_query = """
-            SELECT COUNT(*) FROM query_logs
-            WHERE created_at >= CURRENT_DATE
-        """
-
-        with psycopg2.connect(config.database_url) as conn:
-            with conn.cursor() as cur:
-                # Get content count
-                try:
-                    cur.execute(content_count_query)
-                    content_count = cur.fetchone()[0]
-                except:
-                    content_count = "N/A"
-
-                # Get queries today
-                try:
-                    cur.execute(queries_today_query)
-                    queries_today = cur.fetchone()[0]
-                except:
-                    queries_today = "N/A"
-
-        with col1:
-            st.metric("Monitored URLs", len(urls) if urls else 0)
-
-        with col2:
-            st.metric("Total Content Items", content_count)
-
-        with col3:
-            st.metric("Queries Today", queries_today)
-
-        # Vector store stats
-        st.subheader("Vector Store Stats")
-        vector_stats = vector_store.get_collection_stats()
-        st.json(vector_stats)
-
-        # Manual operations
-        st.subheader("Manual Operations")
-
-        if st.button("Trigger Content Update"):
-            with st.spinner("Retrieving content from monitored URLs..."):
-                # Get active URLs
-                urls_to_update = [item['url'] for item in db_manager.get_active_urls()]
-
-                if urls_to_update:
-                    # Run content retrieval
-                    result = asyncio.run(content_retriever.retrieve_content(urls_to_update))
-                    new_content_count = sum(1 for item in result if item.get('is_new', False))
-                    st.success(f"Content update completed! Retrieved {len(result)} URLs, {new_content_count} with new content.")
-                else:
-                    st.warning("No URLs configured for monitoring")
-
-        if st.button("Send Test Summary Email"):
-            with st.spinner("Sending test email..."):
-                # Create a test summary
-                test_summary = {
-                    "summary": "This is a test summary email from the AI Assistant Agent.",
-                    "content_count": 3,
-                    "sources": [
-                        {"title": "Test Source 1", "url": "https://example.com/1"},
-                        {"title": "Test Source 2", "url": "https://example.com/2"}
-                    ],
-                    "generated_at": datetime.now().isoformat()
-                }
-
-                # Send the email
-                if asyncio.run(email_service.send_daily_summary(test_summary)):
-                    st.success("Test email sent successfully!")
-                else:
-                    st.error("Failed to send test email")
+    # Initialize all components
+    components = init_components()
 
-        # Database maintenance
-        st.subheader("Database Maintenance")
+    # Sidebar for configuration; each part of the page below is a fragment, so
+    # interacting with one reruns only that part instead of the whole script
+    with st.sidebar:
+        _sidebar_urls(components["db_manager"])
 
-        col1, col2 = st.columns(2)
+    # Main content area
+    tab1, tab2, tab3 = st.tabs(["💬 Chat", "📊 Summaries", "⚙️ Admin"])
 
-        with col1:
-            if st.button("Reset Vector Store"):
-                if vector_store.reset_collection():
-                    st.success("Vector store reset successfully!")
-                else:
-                    st.error("Failed to reset vector store")
+    with tab1:
+        _chat_tab(components)
 
-        with col2:
-            backup_path = st.text_input("Backup Path:", value="./data/vector_store_backup")
-            if st.button("Backup Vector Store"):
-                if vector_store.backup_collection(backup_path):
-                    st.success(f"Vector store backed up to {backup_path}")
-                else:
-                    st.error("Failed to backup vector store")
+    with tab2:
+        _summaries_tab(components["db_manager"])
+
+    with tab3:
+        _admin_tab(components)
 
 if __name__ == "__main__":
     main()